@@ -1,17 +1,101 @@
-from .data import carregar_dados, carregar_csv, carregar_json
-from .logic import calcular_score, calcular_atraso, calcular_acertos, validar_estatisticas
+from .data import (
+    carregar_dados, carregar_csv, carregar_json, DrawHistory,
+    carregar_binario, salvar_binario, anexar_binario,
+    anexar_journal, carregar_journal, compactar_historico,
+)
+from .logic import (
+    calcular_score, calcular_atraso, calcular_acertos, validar_estatisticas,
+    dezenas_para_mascara, mascara_para_dezenas, contar_acertos_mascara,
+    calcular_score_mascara, calcular_atraso_mascara,
+)
+from .batch import calcular_scores_lote, matriz_sorteios, matriz_acertos, popcount32
+from .ranking import ranking_completo, combinacoes_mascaras
+from .state import EstadoRanking, sincronizar_estado, carregar_estado, salvar_estado
+from .hamming import histograma_acertos, scores_espectrais
+from .dashboard import EstadoDashboard, sincronizar_dashboard, montar_painel, gerar_painel
+from .inverted_index import IndiceInvertido
+from .structured import distribuicao_acertos, avaliar_familia, FamiliaFora
+from .backtest import backtest, ResultadoBacktest, JogosFixos
+from .montecarlo import simular, sorteios_aleatorios, ResultadoSimulacao
+from .coverage import verificar_cobertura, RelatorioCobertura
+from .covering_design import buscar_fechamento
+from .cooccurrence import (
+    TabelaCoocorrencia, sincronizar_coocorrencia, contar_subconjuntos,
+    rank_subconjunto, subconjunto_do_rank,
+)
+from .store import (
+    carregar_historico, adicionar_concursos, atualizar_derivados,
+    verificar_sequencia, reparar_lacunas, compactar_journal,
+)
+from .ingest import baixar_concursos, baixar_ultimo
+from .pipeline import PipelineAtualizacao
 from .results import carregar_ranking, salvar_ranking, buscar_resultado_mais_recente
-from .config import PESOS, CSV_FILE, CACHE_FILE, RESULTS_DIR
+from .config import PESOS, CSV_FILE, CACHE_FILE, HISTORY_FILE, DATA_DIR, RESULTS_DIR
 from .utils import VERDE, AMARELO, VERMELHO, CIANO, ROXO, AZUL, RESET, NEGRITO, format_currency
 
 __all__ = [
     'carregar_dados',
     'carregar_csv',
     'carregar_json',
+    'DrawHistory',
+    'carregar_binario',
+    'salvar_binario',
+    'anexar_binario',
+    'anexar_journal',
+    'carregar_journal',
+    'compactar_historico',
     'calcular_score',
     'calcular_atraso',
     'calcular_acertos',
     'validar_estatisticas',
+    'dezenas_para_mascara',
+    'mascara_para_dezenas',
+    'contar_acertos_mascara',
+    'calcular_score_mascara',
+    'calcular_atraso_mascara',
+    'calcular_scores_lote',
+    'matriz_sorteios',
+    'matriz_acertos',
+    'popcount32',
+    'ranking_completo',
+    'combinacoes_mascaras',
+    'EstadoRanking',
+    'sincronizar_estado',
+    'carregar_estado',
+    'salvar_estado',
+    'histograma_acertos',
+    'scores_espectrais',
+    'EstadoDashboard',
+    'sincronizar_dashboard',
+    'montar_painel',
+    'gerar_painel',
+    'IndiceInvertido',
+    'TabelaCoocorrencia',
+    'sincronizar_coocorrencia',
+    'contar_subconjuntos',
+    'rank_subconjunto',
+    'distribuicao_acertos',
+    'avaliar_familia',
+    'FamiliaFora',
+    'backtest',
+    'ResultadoBacktest',
+    'JogosFixos',
+    'simular',
+    'sorteios_aleatorios',
+    'ResultadoSimulacao',
+    'verificar_cobertura',
+    'RelatorioCobertura',
+    'buscar_fechamento',
+    'subconjunto_do_rank',
+    'carregar_historico',
+    'adicionar_concursos',
+    'atualizar_derivados',
+    'verificar_sequencia',
+    'reparar_lacunas',
+    'compactar_journal',
+    'baixar_concursos',
+    'baixar_ultimo',
+    'PipelineAtualizacao',
     'carregar_ranking',
     'salvar_ranking',
     'buscar_resultado_mais_recente',
@@ -0,0 +1,57 @@
+import gzip
+import os
+
+try:
+    import brotli
+except ImportError:
+    # Sem o módulo brotli, só a variante gzip é gerada
+    brotli = None
+
+# --- VARIANTES COMPRIMIDAS DOS ARTEFATOS ---
+# Quem grava um artefato servido pelo serve_app gera junto <arquivo>.gz (e
+# <arquivo>.br, se o brotli estiver instalado). O servidor escolhe a variante
+# pelo Accept-Encoding, sem comprimir nada a cada requisição.
+
+EXTENSOES = {"gzip": ".gz", "br": ".br"}
+
+
+def _comprimir(dados, codificacao):
+    if codificacao == "gzip":
+        return gzip.compress(dados, compresslevel=9, mtime=0)
+    return brotli.compress(dados, quality=11)
+
+
+def codificacoes_disponiveis():
+    return [c for c in EXTENSOES if c != "br" or brotli is not None]
+
+
+def gravar_comprimidos(caminho):
+    """Grava as variantes comprimidas de um arquivo (troca atômica). Retorna os caminhos."""
+    with open(caminho, "rb") as f:
+        dados = f.read()
+    gravados = []
+    for codificacao in codificacoes_disponiveis():
+        destino = caminho + EXTENSOES[codificacao]
+        tmp = destino + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_comprimir(dados, codificacao))
+        os.replace(tmp, destino)
+        gravados.append(destino)
+    return gravados
+
+
+def variante_atualizada(caminho, codificacao):
+    """Caminho da variante comprimida se ela existir e não for mais velha que o original."""
+    destino = caminho + EXTENSOES[codificacao]
+    try:
+        if os.stat(destino).st_mtime_ns >= os.stat(caminho).st_mtime_ns:
+            return destino
+    except OSError:
+        pass
+    return None
+
+
+def remover_comprimidos(caminho):
+    for ext in EXTENSOES.values():
+        if os.path.exists(caminho + ext):
+            os.remove(caminho + ext)
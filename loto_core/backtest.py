@@ -0,0 +1,175 @@
+"""
+Backtest walk-forward de estratégias de aposta.
+
+Uma estratégia é um callable estrategia(prefixo) -> apostas: recebe a view
+do histórico até o concurso anterior (DrawHistory, sem cópia) e devolve as
+apostas do concurso seguinte em qualquer formato aceito por para_mascaras.
+Cada conjunto de apostas é conferido contra o sorteio real com popcount
+vetorizado e vira uma linha de contagens por quantidade de acertos (0..25);
+custo, prêmio e banca saem dessas contagens pela tabela de prêmios.
+
+Atalhos opcionais da estratégia, usados quando existem:
+- atributo `mascaras`: apostas fixas (não dependem do prefixo); todos os
+  concursos são conferidos de uma vez, sem laço por concurso.
+- método `distribuicao(prefixo, sorteio)`: devolve direto as contagens por
+  acertos (ex.: famílias estruturadas avaliadas em forma fechada) e
+  `quantidade(prefixo)`, o número de apostas.
+
+Com processos > 1 o intervalo de concursos é dividido em faixas contíguas
+distribuídas entre processos (parallel.mapear); a estratégia precisa ser picklable
+(função de módulo, functools.partial ou instância de classe de módulo).
+"""
+import numpy as np
+from .batch import popcount32, para_mascaras
+from .data import DrawHistory
+from .parallel import mapear, processos_disponiveis
+
+# Prêmios médios por faixa (15 e 14 variam a cada concurso) e preço da aposta simples
+PREMIOS_MEDIOS = {15: 1_500_000, 14: 1_500, 13: 25, 12: 10, 11: 5}
+PRECO_APOSTA = 3
+
+class JogosFixos:
+    """Estratégia que aposta sempre os mesmos jogos."""
+    __slots__ = ("mascaras",)
+
+    def __init__(self, jogos):
+        self.mascaras = para_mascaras(jogos)
+
+    def __call__(self, prefixo):
+        return self.mascaras
+
+
+class ResultadoBacktest:
+    """
+    Contagens por concurso apostado: faixas[i, h] = apostas com h acertos no
+    concurso ids[i]; apostas[i] = quantas apostas foram feitas nele.
+    """
+    __slots__ = ("ids", "apostas", "faixas", "premios", "preco")
+
+    def __init__(self, ids, apostas, faixas, premios=PREMIOS_MEDIOS, preco=PRECO_APOSTA):
+        self.ids = np.asarray(ids, dtype=np.int32)
+        self.apostas = np.asarray(apostas, dtype=np.int64)
+        self.faixas = np.asarray(faixas, dtype=np.int64)
+        self.premios = dict(premios)
+        self.preco = preco
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def juntar(cls, partes, premios=PREMIOS_MEDIOS, preco=PRECO_APOSTA):
+        """Concatena resultados de faixas consecutivas de concursos."""
+        partes = list(partes)
+        return cls(
+            np.concatenate([p.ids for p in partes]) if partes else [],
+            np.concatenate([p.apostas for p in partes]) if partes else [],
+            np.concatenate([p.faixas for p in partes]) if partes else np.zeros((0, 26)),
+            premios, preco,
+        )
+
+    @property
+    def valores(self):
+        """Prêmio por quantidade de acertos (0..25)."""
+        valores = np.zeros(self.faixas.shape[1], dtype=np.int64)
+        for pontos, valor in self.premios.items():
+            valores[pontos] = valor
+        return valores
+
+    @property
+    def custo(self):
+        """Custo por concurso."""
+        return self.apostas * self.preco
+
+    @property
+    def premio(self):
+        """Prêmio por concurso."""
+        return self.faixas @ self.valores
+
+    @property
+    def melhor(self):
+        """Maior acerto entre as apostas de cada concurso (-1 sem apostas)."""
+        tem = self.faixas > 0
+        maior = self.faixas.shape[1] - 1 - tem[:, ::-1].argmax(axis=1)
+        return np.where(tem.any(axis=1), maior, -1)
+
+    def contagens(self):
+        """Total de apostas por quantidade de acertos (0..25)."""
+        return self.faixas.sum(axis=0)
+
+    def banca(self, inicial=0):
+        """Curva da banca: saldo acumulado depois de cada concurso."""
+        return inicial + np.cumsum(self.premio - self.custo)
+
+    def resumo(self):
+        custo, premio = int(self.custo.sum()), int(self.premio.sum())
+        return {
+            "concursos": len(self),
+            "custo": custo,
+            "premio": premio,
+            "saldo": premio - custo,
+            "retorno": premio / custo if custo else 0.0,
+            "contagens": {p: int(self.contagens()[p]) for p in sorted(self.premios, reverse=True)},
+        }
+
+
+def _avaliar(estrategia, historico, ini, fim):
+    """Contagens por acertos (fim-ini x 26) e apostas por concurso, de ini a fim-1."""
+    sorteios = historico.mascaras
+    fixas = getattr(estrategia, "mascaras", None)
+    if fixas is not None:
+        faixas = np.zeros((fim - ini, 26), dtype=np.int64)
+        passo = max(1, (1 << 22) // max(len(fixas), 1))
+        for a in range(ini, fim, passo):
+            b = min(a + passo, fim)
+            acertos = popcount32(fixas[None, :] & sorteios[a:b, None])
+            linhas = np.repeat(np.arange(b - a), len(fixas))
+            faixas[a - ini:b - ini] = np.bincount(
+                linhas * 26 + acertos.ravel(), minlength=(b - a) * 26
+            ).reshape(-1, 26)
+        return faixas, np.full(fim - ini, len(fixas), dtype=np.int64)
+
+    fechada = getattr(estrategia, "distribuicao", None)
+    faixas = np.zeros((fim - ini, 26), dtype=np.int64)
+    apostas = np.zeros(fim - ini, dtype=np.int64)
+    for i in range(ini, fim):
+        prefixo = historico[:i]
+        if fechada is not None:
+            dist = fechada(prefixo, int(sorteios[i]))
+            faixas[i - ini, :len(dist)] = dist
+            apostas[i - ini] = estrategia.quantidade(prefixo)
+        else:
+            jogos = para_mascaras(estrategia(prefixo))
+            faixas[i - ini] = np.bincount(popcount32(jogos & sorteios[i]), minlength=26)
+            apostas[i - ini] = len(jogos)
+    return faixas, apostas
+
+
+def _avaliar_faixa(historico, args):
+    estrategia, ini, fim = args
+    return _avaliar(estrategia, historico, ini, fim)
+
+
+def backtest(historico, estrategia, premios=PREMIOS_MEDIOS, preco=PRECO_APOSTA,
+             inicio=1, fim=None, processos=1, faixas_por_processo=4):
+    """
+    Aposta estrategia(historico[:i]) no concurso i, para i de `inicio` a
+    `fim`-1 (posições no histórico; inicio=0 aposta o primeiro concurso com
+    prefixo vazio). Retorna um ResultadoBacktest.
+    """
+    historico = DrawHistory.de_concursos(historico)
+    fim = len(historico) if fim is None else min(fim, len(historico))
+    inicio = max(inicio, 0)
+    if fim <= inicio:
+        return ResultadoBacktest([], [], np.zeros((0, 26)), premios, preco)
+
+    processos = processos_disponiveis(processos)
+    if fim - inicio <= processos:
+        processos = 1
+    n_faixas = processos * faixas_por_processo if processos > 1 else 1
+    limites = np.linspace(inicio, fim, n_faixas + 1).astype(int)
+    tarefas = [(estrategia, int(a), int(b)) for a, b in zip(limites[:-1], limites[1:]) if b > a]
+    parciais = list(mapear(_avaliar_faixa, tarefas, historico, processos))
+    faixas = np.concatenate([f for f, _ in parciais])
+    apostas = np.concatenate([a for _, a in parciais])
+
+    return ResultadoBacktest(historico.ids[inicio:fim], apostas, faixas, premios, preco)
@@ -0,0 +1,150 @@
+import numpy as np
+from .config import PESOS
+from .logic import dezenas_para_mascara
+
+# Faixas de acerto na ordem das colunas das matrizes de contagem
+FAIXAS = (11, 12, 13, 14, 15)
+PESOS_ARRAY = np.array([PESOS[f] for f in FAIXAS], dtype=np.int64)
+
+_BITS = np.arange(25, dtype=np.uint32)
+
+
+def popcount32(mascaras):
+    """Popcount elemento a elemento de um array de máscaras (até 32 bits)."""
+    mascaras = np.asarray(mascaras, dtype=np.uint32)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(mascaras).astype(np.uint8)
+    v = mascaras - ((mascaras >> 1) & 0x55555555)
+    v = (v & 0x33333333) + ((v >> 2) & 0x33333333)
+    v = (v + (v >> 4)) & 0x0F0F0F0F
+    return ((v * 0x01010101) >> 24).astype(np.uint8)
+
+
+def para_mascaras(itens):
+    """
+    Normaliza jogos/sorteios para um array uint32 de máscaras.
+    Aceita DrawHistory, array de máscaras, lista de ints, lista de iteráveis
+    de dezenas ou lista de concursos (id, data, dezenas_set).
+    """
+    if hasattr(itens, "mascaras"):
+        return itens.mascaras
+    if isinstance(itens, np.ndarray):
+        return itens.astype(np.uint32, copy=False)
+    itens = list(itens)
+    if itens and isinstance(itens[0], tuple) and len(itens[0]) == 3 and not isinstance(itens[0][2], int):
+        itens = [d for _, _, d in itens]
+    return np.fromiter(
+        (m if isinstance(m, int) else dezenas_para_mascara(m) for m in itens),
+        dtype=np.uint32, count=len(itens)
+    )
+
+
+def mascaras_para_matriz(mascaras, dtype=np.uint8):
+    """Expande máscaras em uma matriz densa (N x 25) de 0/1."""
+    mascaras = para_mascaras(mascaras)
+    return ((mascaras[:, None] >> _BITS) & 1).astype(dtype)
+
+
+def espalhar_mascaras(locais, posicoes):
+    """
+    Converte máscaras locais (bit j = j-ésimo elemento de `posicoes`) em
+    máscaras de dezenas (bit posicoes[j]).
+    """
+    locais = np.asarray(locais, dtype=np.uint32)
+    globais = np.zeros(locais.shape, dtype=np.uint32)
+    for j, p in enumerate(posicoes):
+        globais |= ((locais >> np.uint32(j)) & np.uint32(1)) << np.uint32(p)
+    return globais
+
+
+def compactar_mascaras(mascaras, posicoes):
+    """Inverso de espalhar_mascaras: bits fora de `posicoes` são descartados."""
+    mascaras = para_mascaras(mascaras)
+    locais = np.zeros(mascaras.shape, dtype=np.uint32)
+    for j, p in enumerate(posicoes):
+        locais |= ((mascaras >> np.uint32(p)) & np.uint32(1)) << np.uint32(j)
+    return locais
+
+
+def matriz_sorteios(concursos, dtype=np.uint8):
+    """Matriz (sorteios x 25) de 0/1 a partir do histórico."""
+    return mascaras_para_matriz(concursos, dtype)
+
+
+def matriz_acertos(jogos, concursos):
+    """Matriz (jogos x sorteios) com a quantidade de acertos de cada par."""
+    jogos_m = mascaras_para_matriz(jogos, np.float32)
+    sorteios_m = mascaras_para_matriz(concursos, np.float32)
+    return (jogos_m @ sorteios_m.T).astype(np.uint8)
+
+
+def calcular_scores_lote(jogos, concursos, ponto_minimo=11, bloco=4096):
+    """
+    Pontua vários jogos contra todo o histórico de uma vez.
+    concursos deve estar em ordem cronológica (mais antigo primeiro).
+    Retorna (scores[G], contagens[G x 5] para 11..15, atrasos[G]).
+    O atraso conta os sorteios desde o último acerto >= ponto_minimo
+    (len(concursos) se nunca acertou).
+    """
+    jogos_mask = para_mascaras(jogos)
+    sorteios_t = np.ascontiguousarray(mascaras_para_matriz(concursos, np.float32).T)
+    total = sorteios_t.shape[1]
+
+    contagens = np.zeros((len(jogos_mask), len(FAIXAS)), dtype=np.int32)
+    atrasos = np.full(len(jogos_mask), total, dtype=np.int32)
+
+    for ini in range(0, len(jogos_mask), bloco):
+        jogos_m = mascaras_para_matriz(jogos_mask[ini:ini + bloco], np.float32)
+        acertos = (jogos_m @ sorteios_t).astype(np.uint8)
+        for col, faixa in enumerate(FAIXAS):
+            contagens[ini:ini + bloco, col] = np.count_nonzero(acertos == faixa, axis=1)
+
+        # Último índice com acerto >= ponto_minimo, procurando do fim para o início
+        premiado = acertos[:, ::-1] >= ponto_minimo
+        primeiro = premiado.argmax(axis=1)
+        achou = premiado[np.arange(len(primeiro)), primeiro]
+        atrasos[ini:ini + bloco] = np.where(achou, primeiro, total)
+
+    scores = contagens @ PESOS_ARRAY
+    return scores, contagens, atrasos
+
+
+def calcular_atrasos_faixas(jogos, concursos, faixas=FAIXAS, bloco=4096):
+    """
+    Atraso de cada jogo para cada faixa mínima de acertos: sorteios desde o
+    último com acertos >= faixa (len(concursos) se nunca houve).
+    Retorna um array (G x len(faixas)).
+    """
+    jogos_mask = para_mascaras(jogos)
+    sorteios_t = np.ascontiguousarray(mascaras_para_matriz(concursos, np.float32).T)
+    total = sorteios_t.shape[1]
+    atrasos = np.full((len(jogos_mask), len(faixas)), total, dtype=np.int32)
+
+    for ini in range(0, len(jogos_mask), bloco):
+        jogos_m = mascaras_para_matriz(jogos_mask[ini:ini + bloco], np.float32)
+        acertos = (jogos_m @ sorteios_t).astype(np.uint8)[:, ::-1]
+        linhas = np.arange(len(acertos))
+        for col, faixa in enumerate(faixas):
+            premiado = acertos >= faixa
+            primeiro = premiado.argmax(axis=1)
+            atrasos[ini:ini + bloco, col] = np.where(premiado[linhas, primeiro], primeiro, total)
+    return atrasos
+
+
+def contagens_para_dict(linha):
+    """Converte uma linha da matriz de contagens no dict {11: n, ..., 15: n}."""
+    return {f: int(v) for f, v in zip(FAIXAS, linha)}
+
+
+def indices_maiores(valores, n):
+    """
+    Índices dos n maiores valores, do maior para o menor; empates pelo menor
+    índice. Só os candidatos acima do corte (argpartition) são ordenados.
+    """
+    valores = np.asarray(valores)
+    if len(valores) > n:
+        corte = np.partition(valores, len(valores) - n)[len(valores) - n]
+        idx = np.flatnonzero(valores >= corte)
+    else:
+        idx = np.arange(len(valores))
+    return idx[np.lexsort((idx, -valores[idx].astype(np.int64)))][:n]
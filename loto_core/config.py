@@ -2,8 +2,14 @@ import os
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, "data")
 CSV_FILE = os.path.join(BASE_DIR, "lotofacil.csv")
-CACHE_FILE = os.path.join(BASE_DIR, "lotofacil_cache.json")
+CACHE_FILE = os.path.join(DATA_DIR, "lotofacil_cache.json")
+HISTORY_FILE = os.path.join(DATA_DIR, "lotofacil_cache.bin")
+JOURNAL_FILE = os.path.join(DATA_DIR, "lotofacil_cache.journal")
+
+# API oficial da Caixa ("{}" = número do concurso; vazio = mais recente)
+API_CAIXA = "https://servicebus2.caixa.gov.br/portaldeloterias/api/lotofacil/{}"
 
 # Score Settings
 PESOS = {
@@ -18,3 +24,7 @@ PESOS = {
 FRONTEND_JSON_PATH = os.path.join(BASE_DIR, "src", "data", "combinacoes.json")
 FRONTEND_SCREEN_PATH = os.path.join(BASE_DIR, "src", "screens", "AnalyzeScreen.js")
 RESULTS_DIR = os.path.join(BASE_DIR, "resultados")
+
+# Super App (dashboard)
+DASHBOARD_FILE = os.path.join(DATA_DIR, "dashboard_data.json")
+RANKINGS_APP_DIR = os.path.join(BASE_DIR, "src", "data", "resultados")
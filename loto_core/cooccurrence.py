@@ -0,0 +1,179 @@
+"""
+Tabelas de coocorrência de subconjuntos de 2 a 6 dezenas.
+
+Cada tabela é um array denso com uma posição por k-subconjunto de {1..25},
+indexado pelo rank colex (o mesmo índice de combinacoes_mascaras(k)):
+rank({c_1 < ... < c_k}) = C(c_1, 1) + C(c_2, 2) + ... + C(c_k, k), com as
+dezenas contadas a partir de 0. Um sorteio de 15 dezenas contribui com seus
+C(15, k) subconjuntos, obtidos de uma tabela fixa de posições (0..14) e
+somados de uma vez com bincount.
+"""
+import os
+from collections import deque
+from functools import partial
+from itertools import combinations
+from math import comb
+import numpy as np
+from .batch import para_mascaras, mascaras_para_matriz, indices_maiores
+from .data import DrawHistory
+from .ranking import combinacoes_mascaras
+from .state import ESTADO_DIR, sincronizar_incremental
+
+TAMANHOS = (2, 3, 4, 5, 6)
+DEZENAS_SORTEIO = 15
+
+# _BINOM[n, j] = C(n, j) para n < 25, j <= 6
+_BINOM = np.array([[comb(n, j) for j in range(max(TAMANHOS) + 1)] for n in range(25)], dtype=np.int32)
+# posições (0..14) dos C(15, k) subconjuntos de um sorteio
+_POSICOES = {k: np.array(list(combinations(range(DEZENAS_SORTEIO), k)), dtype=np.intp) for k in TAMANHOS}
+
+
+def rank_subconjunto(dezenas):
+    """Rank colex de um conjunto de dezenas (1..25)."""
+    return sum(comb(d - 1, i) for i, d in enumerate(sorted(dezenas), 1))
+
+
+def subconjunto_do_rank(rank, k):
+    """Dezenas (1..25, ordenadas) do k-subconjunto de rank `rank`."""
+    dezenas = []
+    for i in range(k, 0, -1):
+        c = i - 1
+        while comb(c + 1, i) <= rank:
+            c += 1
+        rank -= comb(c, i)
+        dezenas.append(c + 1)
+    return dezenas[::-1]
+
+
+def _dezenas_dos_sorteios(mascaras):
+    """Matriz (N x 15) com os índices 0..24 das dezenas de cada sorteio."""
+    matriz = mascaras_para_matriz(mascaras, bool)
+    if np.any(matriz.sum(axis=1) != DEZENAS_SORTEIO):
+        raise ValueError(f"Todos os sorteios precisam ter {DEZENAS_SORTEIO} dezenas.")
+    return np.nonzero(matriz)[1].reshape(-1, DEZENAS_SORTEIO).astype(np.intp)
+
+
+def contar_subconjuntos(mascaras, k, bloco=256):
+    """Contagem de cada k-subconjunto (array denso de C(25, k)) nos sorteios dados."""
+    contagem = np.zeros(comb(25, k), dtype=np.int64)
+    dezenas = _dezenas_dos_sorteios(para_mascaras(mascaras))
+    colunas = np.arange(1, k + 1)
+    for ini in range(0, len(dezenas), bloco):
+        sub = dezenas[ini:ini + bloco][:, _POSICOES[k]]   # (B x C(15,k) x k), crescente
+        ranks = _BINOM[sub, colunas].sum(axis=2)
+        contagem += np.bincount(ranks.ravel(), minlength=len(contagem))
+    return contagem
+
+
+class TabelaCoocorrencia:
+    """
+    Contagens de todos os k-subconjuntos (k em `tamanhos`) sobre o histórico
+    inteiro (janela=None) ou sobre os últimos `janela` sorteios.
+    """
+    __slots__ = ("tamanhos", "janela", "contagens", "recentes", "total", "concurso")
+
+    def __init__(self, tamanhos=TAMANHOS, janela=None, contagens=None, recentes=(), total=0, concurso=None):
+        self.tamanhos = tuple(tamanhos)
+        self.janela = janela
+        self.contagens = contagens or {k: np.zeros(comb(25, k), dtype=np.int32) for k in self.tamanhos}
+        self.recentes = deque(recentes, maxlen=janela) if janela else None  # máscaras dentro da janela
+        self.total = total          # sorteios já aplicados
+        self.concurso = concurso    # id do último sorteio aplicado
+
+    def aplicar(self, mascaras, concurso):
+        """Aplica um ou mais sorteios novos (ordem cronológica) numa passada vetorizada."""
+        mascaras = para_mascaras(mascaras)
+        self.total += len(mascaras)
+        self.concurso = concurso
+        if self.janela:
+            mascaras = mascaras[-self.janela:]
+            excesso = len(self.recentes) + len(mascaras) - self.janela
+            saindo = [self.recentes[i] for i in range(max(excesso, 0))]
+            self.recentes.extend(mascaras.tolist())
+        else:
+            saindo = []
+        for k in self.tamanhos:
+            self.contagens[k] += contar_subconjuntos(mascaras, k).astype(np.int32)
+            if saindo:
+                self.contagens[k] -= contar_subconjuntos(saindo, k).astype(np.int32)
+
+    def contagem(self, dezenas):
+        """Quantos sorteios contêm todas as `dezenas` (2 a 6 delas)."""
+        return int(self.contagens[len(dezenas)][rank_subconjunto(dezenas)])
+
+    def top(self, k, n=15):
+        """Os n k-subconjuntos mais frequentes como lista de (dezenas, contagem); empate pelo rank."""
+        contagens = self.contagens[k]
+        return [(subconjunto_do_rank(int(i), k), int(contagens[i])) for i in indices_maiores(contagens, n)]
+
+    def mais_frequentes(self, k, n=15):
+        """
+        Como top, mas com os empates na ordem de Counter.most_common sobre os
+        sorteios da janela: primeira aparição (sorteio mais antigo, depois
+        ordem lexicográfica). Só para tabelas de janela; omite contagem 0.
+        """
+        if self.recentes is None:
+            raise ValueError("Desempate por primeira aparição só existe em tabelas de janela.")
+        contagens = self.contagens[k]
+        n = min(n, int(np.count_nonzero(contagens)))
+        if not n:
+            return []
+        # todos os empatados com o n-ésimo entram na disputa
+        corte = contagens[indices_maiores(contagens, n)[-1]]
+        candidatos = np.flatnonzero(contagens >= corte)
+        mascaras = combinacoes_mascaras(k)[candidatos]
+        recentes = np.array(self.recentes, dtype=np.uint32)
+        primeira = ((recentes[:, None] & mascaras[None, :]) == mascaras[None, :]).argmax(axis=0)
+        dezenas = [subconjunto_do_rank(int(i), k) for i in candidatos]
+        ordem = sorted(range(len(candidatos)), key=lambda j: (-contagens[candidatos[j]], primeira[j], dezenas[j]))
+        return [(dezenas[j], int(contagens[candidatos[j]])) for j in ordem[:n]]
+
+
+def construir_coocorrencia(historico, tamanhos=TAMANHOS, janela=None):
+    """Tabela do zero a partir do histórico (DrawHistory ou lista de concursos)."""
+    historico = DrawHistory.de_concursos(historico)
+    tabela = TabelaCoocorrencia(tamanhos, janela)
+    if len(historico):
+        tabela.aplicar(historico.mascaras, int(historico.ids[-1]))
+    return tabela
+
+
+def caminho_coocorrencia(janela=None):
+    return os.path.join(ESTADO_DIR, f"coocorrencia_{janela or 'total'}.npz")
+
+
+def salvar_coocorrencia(tabela):
+    os.makedirs(ESTADO_DIR, exist_ok=True)
+    caminho = caminho_coocorrencia(tabela.janela)
+    tmp = caminho + ".tmp.npz"
+    np.savez(
+        tmp,
+        meta=np.array([tabela.total, tabela.concurso or 0, tabela.janela or 0], dtype=np.int64),
+        recentes=np.array(list(tabela.recentes or ()), dtype=np.uint32),
+        **{f"k{k}": c for k, c in tabela.contagens.items()},
+    )
+    os.replace(tmp, caminho)
+    return caminho
+
+
+def carregar_coocorrencia(janela=None, tamanhos=TAMANHOS):
+    caminho = caminho_coocorrencia(janela)
+    if not os.path.exists(caminho):
+        return None
+    with np.load(caminho) as f:
+        if any(f"k{k}" not in f for k in tamanhos):
+            return None
+        total, concurso, _ = (int(v) for v in f["meta"])
+        contagens = {k: f[f"k{k}"] for k in tamanhos}
+        return TabelaCoocorrencia(tamanhos, janela, contagens, f["recentes"].tolist(), total, concurso)
+
+
+def sincronizar_coocorrencia(historico, tamanhos=TAMANHOS, janela=None):
+    """Tabela da janela (None = histórico inteiro) em dia com o histórico; ver sincronizar_incremental."""
+    return sincronizar_incremental(
+        historico,
+        partial(carregar_coocorrencia, janela, tamanhos),
+        partial(construir_coocorrencia, tamanhos=tamanhos, janela=janela),
+        lambda tabela, novos: tabela.aplicar(novos.mascaras, int(novos.ids[-1])),
+        salvar_coocorrencia,
+    )
@@ -0,0 +1,131 @@
+"""
+Verificação exaustiva de fechamentos.
+
+Um fechamento é um conjunto de jogos sobre um grupo (pool) de n dezenas.
+Os cenários são todos os C(n, m) subconjuntos de m dezenas do grupo (m = 15:
+o sorteio saiu inteiro dentro do grupo). Para cada cenário interessa o
+maior acerto entre os jogos; a garantia do fechamento é o mínimo disso.
+
+Tudo é feito no espaço local do grupo: o bit j é a j-ésima dezena do grupo,
+os cenários são combinacoes_mascaras(m, n) e os jogos são compactados para
+esses bits (dezenas fora do grupo nunca acertam um cenário). Os cenários
+são conferidos em blocos (jogos x cenários) com popcount; com processos > 1
+os blocos são distribuídos entre processos e, com parar_no_primeiro, a
+verificação termina no primeiro bloco com cenário descoberto.
+"""
+from math import comb
+import numpy as np
+from .batch import para_mascaras, popcount32, espalhar_mascaras, compactar_mascaras
+from .logic import mascara_para_dezenas
+from .parallel import mapear
+from .ranking import combinacoes_mascaras
+
+BLOCO_CENARIOS = 1 << 16
+
+class RelatorioCobertura:
+    """
+    distribuicao[h]: cenários cujo melhor jogo fez h acertos (h de 0 até
+    min(tamanho_cenario, maior jogo)).
+    descobertos: máscaras (dezenas) dos cenários abaixo do alvo.
+    completo: False se a verificação parou no primeiro descoberto.
+    """
+    __slots__ = ("grupo", "tamanho_cenario", "alvo", "total", "avaliados",
+                 "distribuicao", "descobertos", "completo")
+
+    def __init__(self, grupo, tamanho_cenario, alvo, total, avaliados, distribuicao, descobertos, completo):
+        self.grupo = grupo
+        self.tamanho_cenario = tamanho_cenario
+        self.alvo = alvo
+        self.total = total
+        self.avaliados = avaliados
+        self.distribuicao = distribuicao
+        self.descobertos = descobertos
+        self.completo = completo
+
+    @property
+    def minimo(self):
+        """Acertos garantidos (sobre os cenários avaliados)."""
+        return int(np.flatnonzero(self.distribuicao)[0]) if self.avaliados else None
+
+    @property
+    def garantido(self):
+        """True se todo cenário tem algum jogo com pelo menos `alvo` acertos."""
+        return self.completo and not len(self.descobertos)
+
+    def cobertos(self, acertos):
+        """Cenários com algum jogo de pelo menos `acertos` acertos."""
+        return int(self.distribuicao[acertos:].sum())
+
+    def cenarios_descobertos(self):
+        return [mascara_para_dezenas(int(m)) for m in self.descobertos]
+
+
+def _melhores(jogos, cenarios):
+    """Maior acerto entre os jogos para cada cenário."""
+    melhor = np.zeros(len(cenarios), dtype=np.uint8)
+    passo = max(4096, (1 << 19) // len(jogos))
+    for ini in range(0, len(cenarios), passo):
+        bloco = cenarios[ini:ini + passo]
+        melhor[ini:ini + passo] = popcount32(jogos[:, None] & bloco[None, :]).max(axis=0)
+    return melhor
+
+
+def _avaliar_bloco(jogos, cenarios, alvo, faixas):
+    melhor = _melhores(jogos, cenarios)
+    descobertos = cenarios[melhor < alvo] if alvo is not None else cenarios[:0]
+    return np.bincount(melhor, minlength=faixas), descobertos, len(cenarios)
+
+
+def _preparar(dados):
+    # a tabela de cenários é montada em cada processo em vez de ser enviada
+    m, n, jogos = dados
+    return combinacoes_mascaras(m, n), jogos
+
+
+def _avaliar_faixa(dados, args):
+    cenarios, jogos = dados
+    ini, fim, alvo, faixas = args
+    return _avaliar_bloco(jogos, cenarios[ini:fim], alvo, faixas)
+
+
+def verificar_cobertura(jogos, grupo, alvo=None, tamanho_cenario=15,
+                        parar_no_primeiro=False, processos=1, bloco=BLOCO_CENARIOS):
+    """
+    Confere os jogos contra todos os C(len(grupo), tamanho_cenario) cenários.
+    grupo: dezenas 1..25 do fechamento; alvo: acertos que deveriam estar
+    garantidos (None só calcula a distribuição). Retorna um RelatorioCobertura.
+    """
+    grupo = sorted(int(d) for d in grupo)
+    n, m = len(grupo), tamanho_cenario
+    if not m <= n <= 25 or len(set(grupo)) != n or grupo[0] < 1 or grupo[-1] > 25:
+        raise ValueError("O grupo precisa ter de tamanho_cenario a 25 dezenas distintas entre 1 e 25.")
+    posicoes = [d - 1 for d in grupo]
+    jogos = compactar_mascaras(para_mascaras(jogos), posicoes)
+    if not len(jogos):
+        raise ValueError("Fechamento sem jogos.")
+
+    # acertos possíveis: 0..min(m, maior jogo)
+    faixas_acerto = min(m, int(popcount32(jogos).max())) + 1
+    total = comb(n, m)
+    limites = list(range(0, total, bloco)) + [total]
+    tarefas = [(a, b, alvo, faixas_acerto) for a, b in zip(limites[:-1], limites[1:])]
+    parciais = mapear(_avaliar_faixa, tarefas, (m, n, jogos), processos, _preparar)
+
+    distribuicao = np.zeros(faixas_acerto, dtype=np.int64)
+    descobertos = []
+    avaliados = 0
+    try:
+        for dist, desc, qtd in parciais:
+            distribuicao += dist
+            descobertos.append(desc)
+            avaliados += qtd
+            if parar_no_primeiro and len(desc):
+                break
+    finally:
+        parciais.close()
+
+    descobertos = np.concatenate(descobertos) if descobertos else np.zeros(0, dtype=np.uint32)
+    return RelatorioCobertura(
+        grupo, m, alvo, total, avaliados, distribuicao,
+        espalhar_mascaras(descobertos, posicoes), avaliados == total,
+    )
@@ -0,0 +1,252 @@
+"""
+Busca de fechamentos (covering designs) com garantia.
+
+Um fechamento n-t-m com jogos de k dezenas cobre um cenário (m dezenas do
+grupo de n) quando algum jogo acerta pelo menos t delas. Todos os C(n, m)
+cenários são alvos; nada é amostrado.
+
+Representação: máscaras locais do grupo (bit j = j-ésima dezena) e um array
+denso `cobertura` de 2**n posições com quantos jogos cobrem cada cenário
+(só as posições de cenários são usadas). Os cenários cobertos por um jogo
+(a "bola" dele) são montados a partir de tabelas de combinações fixas, então
+trocar um jogo só mexe nas posições das duas bolas.
+
+1. Semente gulosa: preguiçosa sobre todos os jogos possíveis (ganhos antigos
+   servem de limite superior num heap e só o topo é recalculado) ou, quando
+   são jogos demais (25 dezenas), o melhor de uma amostra a cada passo.
+2. Busca local com recozimento (estilo Nurmela-Östergård): com b jogos, o
+   custo é o número de cenários descobertos; o movimento troca uma dezena de
+   um jogo por uma de um cenário descoberto. Ao zerar o custo o fechamento é
+   guardado e o jogo mais redundante sai (b - 1).
+3. Reinícios independentes em processos separados; o menor fechamento vence
+   e só é devolvido depois de verificar_cobertura exaustivo.
+"""
+import heapq
+import time
+from math import comb, exp
+import numpy as np
+from .coverage import verificar_cobertura
+from .logic import mascara_para_dezenas
+from .parallel import mapear
+from .ranking import combinacoes_mascaras
+
+LIMITE_CANDIDATOS = 20_000   # acima disso a semente gulosa usa uma amostra
+
+
+class ProblemaCobertura:
+    """Tabelas fixas de um problema n-t-m com jogos de k dezenas."""
+    __slots__ = ("n", "k", "t", "m", "alvos", "tamanho_bola", "_partes")
+
+    def __init__(self, n, k, t, m=15):
+        if not (t <= m <= n and t <= k <= n <= 25):
+            raise ValueError("Parâmetros inválidos: precisa t <= m <= n, t <= k <= n <= 25.")
+        self.n, self.k, self.t, self.m = n, k, t, m
+        self.alvos = combinacoes_mascaras(m, n)
+        # para h acertos: h dezenas do jogo (C(k, h)) e m - h de fora (C(n - k, m - h)),
+        # como matrizes 0/1 sobre as posições "dentro" e "fora" do jogo
+        self._partes = [
+            (_bits(combinacoes_mascaras(h, k), k), _bits(combinacoes_mascaras(m - h, n - k), n - k))
+            for h in range(t, min(k, m) + 1) if m - h <= n - k
+        ]
+        self.tamanho_bola = sum(len(d) * len(f) for d, f in self._partes)
+
+    def bolas(self, jogos):
+        """Cenários (máscaras locais) cobertos por cada jogo: matriz (jogos x tamanho_bola)."""
+        jogos = np.asarray(jogos, dtype=np.uint32).reshape(-1)
+        presentes = (jogos[:, None] >> np.arange(self.n, dtype=np.uint32)) & 1
+        # posições das dezenas do jogo primeiro, depois as de fora (ambas crescentes)
+        ordem = np.argsort(1 - presentes, axis=1, kind="stable").astype(np.uint32)
+        pesos = np.uint32(1) << ordem
+        pesos_dentro, pesos_fora = pesos[:, :self.k].T, pesos[:, self.k:].T
+        return np.concatenate([
+            ((d @ pesos_dentro).T[:, :, None] | (f @ pesos_fora).T[:, None, :]).reshape(len(jogos), -1)
+            for d, f in self._partes
+        ], axis=1)
+
+    def bola(self, jogo):
+        return self.bolas([jogo])[0]
+
+
+def _bits(mascaras, largura):
+    return ((mascaras[:, None] >> np.arange(largura, dtype=np.uint32)) & 1).astype(np.uint32)
+
+
+class _Busca:
+    """Estado de uma busca: jogos atuais, bolas e contagem de cobertura por cenário."""
+    __slots__ = ("p", "rng", "jogos", "bolas", "cobertura", "descobertos", "_pendentes")
+
+    def __init__(self, problema, rng):
+        self.p = problema
+        self.rng = rng
+        self.jogos = []
+        self.bolas = []
+        self.cobertura = np.zeros(1 << problema.n, dtype=np.uint8)
+        self.descobertos = len(problema.alvos)
+        self._pendentes = []
+
+    def adicionar(self, jogo, bola=None):
+        if len(self.jogos) == 255:
+            raise OverflowError("Mais de 255 jogos não cabem na contagem de cobertura (uint8).")
+        bola = self.p.bola(jogo) if bola is None else bola
+        self.descobertos -= int(np.count_nonzero(self.cobertura[bola] == 0))
+        self.cobertura[bola] += 1
+        self.jogos.append(jogo)
+        self.bolas.append(bola)
+
+    def remover(self, i):
+        bola = self.bolas[i]
+        self.cobertura[bola] -= 1
+        self.descobertos += int(np.count_nonzero(self.cobertura[bola] == 0))
+        self.jogos.pop(i)
+        return self.bolas.pop(i)
+
+    def ganho(self, bola):
+        return int(np.count_nonzero(self.cobertura[bola] == 0))
+
+    def descoberto(self):
+        """Um cenário descoberto qualquer (lista renovada só quando esgota)."""
+        while True:
+            while self._pendentes:
+                alvo = self._pendentes.pop()
+                if self.cobertura[alvo] == 0:
+                    return int(alvo)
+            pendentes = self.p.alvos[self.cobertura[self.p.alvos] == 0]
+            self.rng.shuffle(pendentes)
+            self._pendentes = pendentes[:4096].tolist()
+
+    def jogo_para(self, alvo):
+        """Jogo que contém o cenário (completado com dezenas aleatórias se k > m)."""
+        livres = [j for j in range(self.p.n) if not alvo >> j & 1]
+        jogo = alvo
+        if self.p.k > self.p.m:
+            for j in self.rng.choice(livres, self.p.k - self.p.m, replace=False):
+                jogo |= 1 << int(j)
+        else:
+            dentro = [j for j in range(self.p.n) if alvo >> j & 1]
+            for j in self.rng.choice(dentro, self.p.m - self.p.k, replace=False):
+                jogo &= ~(1 << int(j))
+        return jogo
+
+    def redundante(self):
+        """Índice do jogo cuja saída descobre menos cenários."""
+        perdas = [int(np.count_nonzero(self.cobertura[b] == 1)) for b in self.bolas]
+        return int(np.argmin(perdas))
+
+
+def semente_gulosa(busca, candidatos=LIMITE_CANDIDATOS, amostra=64):
+    """
+    Completa a busca de forma gulosa até cobrir todos os cenários.
+    Até `candidatos` jogos possíveis: gulosa preguiçosa sobre todos eles (os
+    ganhos do topo do heap são recalculados em lote; um candidato entra quando
+    seu ganho atual não perde para o limite de nenhum outro). Acima disso, a
+    cada passo entra o melhor de `amostra` jogos montados sobre cenários
+    descobertos.
+    """
+    p = busca.p
+    lote = max(1, (1 << 21) // p.tamanho_bola)
+    if comb(p.n, p.k) > candidatos:
+        while busca.descobertos:
+            jogos = [busca.jogo_para(busca.descoberto()) for _ in range(amostra)]
+            melhor, maior = None, -1
+            for ini in range(0, amostra, lote):
+                bolas = p.bolas(jogos[ini:ini + lote])
+                ganhos = np.count_nonzero(busca.cobertura[bolas] == 0, axis=1)
+                i = int(np.argmax(ganhos))
+                if ganhos[i] > maior:
+                    melhor, maior = (jogos[ini + i], bolas[i]), ganhos[i]
+            busca.adicionar(*melhor)
+        return list(busca.jogos)
+
+    todos = combinacoes_mascaras(p.k, p.n)
+    desempate = busca.rng.permutation(len(todos))
+    heap = [(-p.tamanho_bola, int(d), int(j)) for d, j in zip(desempate, todos)]
+    heapq.heapify(heap)
+    while busca.descobertos:
+        melhor = None
+        while melhor is None:
+            topo = [heapq.heappop(heap) for _ in range(min(lote, len(heap)))]
+            bolas = p.bolas([j for _, _, j in topo])
+            ganhos = np.count_nonzero(busca.cobertura[bolas] == 0, axis=1)
+            i = int(np.argmax(ganhos))
+            if not heap or ganhos[i] >= -heap[0][0]:
+                melhor = (topo[i][2], bolas[i])
+            for j, ((_, d, jogo), ganho) in enumerate(zip(topo, ganhos)):
+                if ganho and (melhor is None or j != i):
+                    heapq.heappush(heap, (-int(ganho), d, jogo))
+        busca.adicionar(*melhor)
+    return list(busca.jogos)
+
+
+def recozimento(busca, melhor, passos=200_000, tempo=None, temperatura=0.5, final=0.05):
+    """
+    Busca local sobre um fechamento completo: tira o jogo mais redundante e
+    tenta recobrir com b - 1 jogos. A temperatura cai geometricamente de
+    `temperatura` a `final` ao longo dos passos e volta ao início a cada jogo
+    removido. Retorna o menor fechamento completo achado.
+    """
+    p = busca.p
+    limite = time.monotonic() + tempo if tempo else None
+    resfriamento = (final / temperatura) ** (1 / passos)
+    inicial = temperatura
+    busca.remover(busca.redundante())
+    for passo in range(passos):
+        if busca.descobertos == 0:
+            melhor = list(busca.jogos)
+            if len(busca.jogos) == 1:
+                break
+            busca.remover(busca.redundante())
+            temperatura = inicial
+            continue
+        if limite and passo % 64 == 0 and time.monotonic() > limite:
+            break
+
+        # mexe num dos jogos mais próximos do cenário descoberto
+        alvo = busca.descoberto()
+        acertos = [(j & alvo).bit_count() for j in busca.jogos]
+        perto = [i for i, a in enumerate(acertos) if a == max(acertos)]
+        i = perto[int(busca.rng.integers(len(perto)))]
+        jogo = busca.jogos[i]
+        saem = [j for j in range(p.n) if jogo >> j & 1 and not alvo >> j & 1]
+        entram = [j for j in range(p.n) if alvo >> j & 1 and not jogo >> j & 1]
+        novo = jogo ^ (1 << int(busca.rng.choice(saem))) ^ (1 << int(busca.rng.choice(entram)))
+
+        antes = busca.descobertos
+        bola_antiga = busca.remover(i)
+        bola_nova = p.bola(novo)
+        busca.adicionar(novo, bola_nova)
+        delta = busca.descobertos - antes
+        if delta > 0 and busca.rng.random() >= exp(-delta / temperatura):
+            busca.remover(len(busca.jogos) - 1)
+            busca.adicionar(jogo, bola_antiga)
+        temperatura *= resfriamento
+    return melhor
+
+
+def _reinicio(parametros, semente):
+    n, k, t, m, passos, tempo, candidatos = parametros
+    problema = ProblemaCobertura(n, k, t, m)
+    busca = _Busca(problema, np.random.default_rng(semente))
+    melhor = semente_gulosa(busca, candidatos)
+    return recozimento(busca, melhor, passos, tempo)
+
+
+def buscar_fechamento(n, k, t, m=15, reinicios=4, semente=None, processos=None,
+                      passos=200_000, tempo=None, candidatos=LIMITE_CANDIDATOS):
+    """
+    Menor fechamento n-t-m (jogos de k dezenas) entre `reinicios` buscas
+    independentes. Retorna a lista de jogos em posições 0..n-1, já conferida
+    por verificar_cobertura; levanta RuntimeError se a verificação falhar.
+    """
+    filhas = np.random.SeedSequence(semente).spawn(reinicios)
+    parametros = (n, k, t, m, passos, tempo, candidatos)
+    jogos = min(mapear(_reinicio, filhas, parametros, processos), key=len)
+    relatorio = verificar_cobertura(jogos, range(1, n + 1), alvo=t, tamanho_cenario=m)
+    if not relatorio.garantido:
+        raise RuntimeError(f"Fechamento {n}-{t}-{m} não passou na verificação exaustiva.")
+    return [[d - 1 for d in mascara_para_dezenas(int(j))] for j in jogos]
+
+
+def limite_inferior(n, k, t, m=15):
+    """Limite de cobertura: C(n, m) / tamanho da bola de um jogo."""
+    bola = sum(comb(k, h) * comb(n - k, m - h) for h in range(t, min(k, m) + 1))
+    return -(-comb(n, m) // bola)
@@ -0,0 +1,357 @@
+import hashlib
+import json
+import os
+from collections import deque
+from functools import partial
+import numpy as np
+from .logic import mascara_para_dezenas
+from .data import DrawHistory
+from .batch import mascaras_para_matriz
+from .state import ESTADO_DIR, sincronizar_incremental
+from .cooccurrence import TabelaCoocorrencia
+from .config import DASHBOARD_FILE, RANKINGS_APP_DIR
+from .artifacts import gravar_comprimidos
+
+# --- AGREGADOS DO DASHBOARD ---
+# Contadores que o dashboard usa, mantidos de forma incremental: aplicar um
+# sorteio novo custa O(25), independente do tamanho do histórico. O que
+# depende só das janelas recentes (estatísticas dos últimos 100, trincas)
+# sai do buffer de máscaras da janela na hora de montar o painel. Reconstruir
+# o estado e as análises da janela são operações vetorizadas sobre a matriz
+# booleana (sorteios x 25).
+
+PRIMOS = {2, 3, 5, 7, 11, 13, 17, 19, 23}
+FIBONACCI = {1, 2, 3, 5, 8, 13, 21}
+MOLDURA = {1, 2, 3, 4, 5, 6, 10, 11, 15, 16, 20, 21, 22, 23, 24, 25}
+
+JANELA = 100            # buffer de sorteios recentes (stats_100, trincas)
+JANELAS_FREQ = (10, 50)  # frequências móveis
+
+_DEZENAS = np.arange(1, 26)
+_PAR = _DEZENAS % 2 == 0
+_PRIMO = np.isin(_DEZENAS, list(PRIMOS))
+_FIBO = np.isin(_DEZENAS, list(FIBONACCI))
+_MOLDURA = np.isin(_DEZENAS, list(MOLDURA))
+
+CAMINHO_ESTADO_DASHBOARD = os.path.join(ESTADO_DIR, "estado_dashboard.json")
+
+
+def maior_sequencia(matriz):
+    """
+    Maior sequência de dezenas consecutivas de cada linha de uma matriz
+    booleana (N x 25), via run-length: início/fim das sequências saem do diff
+    da linha com bordas False.
+    """
+    bordas = np.zeros((len(matriz), 1), dtype=np.int8)
+    delta = np.diff(np.hstack((bordas, matriz.astype(np.int8), bordas)), axis=1)
+    linhas, inicios = np.nonzero(delta == 1)
+    _, fins = np.nonzero(delta == -1)
+    maior = np.zeros(len(matriz), dtype=np.intp)
+    np.maximum.at(maior, linhas, fins - inicios)
+    return maior
+
+
+def estatisticas_janela(ids, matriz):
+    """Linhas de stats_100 do dashboard para os sorteios da matriz (N x 25)."""
+    m = matriz.astype(np.int64)
+    colunas = {
+        "soma": m @ _DEZENAS,
+        "pares": m @ _PAR,
+        "impares": m @ ~_PAR,
+        "primos": m @ _PRIMO,
+        "fibo": m @ _FIBO,
+        "moldura": m @ _MOLDURA,
+        "sequencia": maior_sequencia(matriz),
+    }
+    return [
+        dict(id=int(c), **{k: int(v[i]) for k, v in colunas.items()})
+        for i, c in enumerate(ids)
+    ]
+
+
+def trincas_janela(estado, n=15):
+    """
+    Trincas mais frequentes do buffer, pela tabela de coocorrência da janela;
+    empates na ordem da primeira aparição (sorteio mais antigo, depois ordem
+    lexicográfica).
+    """
+    tabela = TabelaCoocorrencia((3,), JANELA)
+    if estado.janela:
+        tabela.aplicar([m for _, m in estado.janela], estado.concurso)
+    return [{"dezenas": d, "count": c} for d, c in tabela.mais_frequentes(3, n)]
+
+
+class EstadoDashboard:
+    """
+    Agregados corridos do histórico: frequência total, índice da última
+    aparição, soma/quantidade de intervalos entre aparições de cada dezena,
+    frequências das janelas móveis e o buffer dos últimos JANELA sorteios.
+    """
+    __slots__ = ("total", "concurso", "freq", "ultimo", "soma_gaps", "n_gaps",
+                 "freq_janelas", "janela", "gerado")
+
+    def __init__(self, total=0, concurso=None, freq=None, ultimo=None, soma_gaps=None,
+                 n_gaps=None, freq_janelas=None, janela=(), gerado=None):
+        self.total = total                                  # sorteios já aplicados
+        self.concurso = concurso                            # id do último sorteio aplicado
+        self.freq = freq or [0] * 25
+        self.ultimo = ultimo or [-1] * 25                   # índice da última aparição
+        self.soma_gaps = soma_gaps or [0] * 25
+        self.n_gaps = n_gaps or [0] * 25
+        self.freq_janelas = freq_janelas or {w: [0] * 25 for w in JANELAS_FREQ}
+        self.janela = deque((tuple(x) for x in janela), maxlen=JANELA)  # (concurso, mascara)
+        self.gerado = gerado                                # assinatura do último painel gravado
+
+    def aplicar(self, concurso, mascara):
+        """Aplica um sorteio novo (ordem cronológica)."""
+        i = self.total
+        for d in range(25):
+            if mascara >> d & 1:
+                self.freq[d] += 1
+                if self.ultimo[d] >= 0:
+                    self.soma_gaps[d] += i - self.ultimo[d]
+                    self.n_gaps[d] += 1
+                self.ultimo[d] = i
+
+        for w, contagem in self.freq_janelas.items():
+            saindo = self.janela[-w][1] if len(self.janela) >= w else 0
+            for d in range(25):
+                contagem[d] += (mascara >> d & 1) - (saindo >> d & 1)
+
+        self.janela.append((concurso, mascara))
+        self.total += 1
+        self.concurso = concurso
+
+    def atrasos(self):
+        return {d + 1: self.total - 1 - u if u >= 0 else self.total for d, u in enumerate(self.ultimo)}
+
+    def recorrencia(self):
+        """Intervalo médio entre aparições de cada dezena."""
+        return {
+            d + 1: round(self.soma_gaps[d] / self.n_gaps[d], 2) if self.n_gaps[d] else self.total
+            for d in range(25)
+        }
+
+    def faltando_ciclo(self):
+        """
+        Dezenas que faltam para fechar o ciclo corrente, contado de trás para
+        frente a partir do último sorteio: são as de última aparição mais antiga.
+        """
+        mais_antiga = min(self.ultimo)
+        return [d + 1 for d, u in enumerate(self.ultimo) if u == mais_antiga]
+
+    def matriz_janela(self):
+        """(ids, matriz booleana JANELA x 25) dos sorteios do buffer."""
+        ids = [c for c, _ in self.janela]
+        return ids, mascaras_para_matriz([m for _, m in self.janela], bool)
+
+    def para_dict(self):
+        return {
+            "total": self.total, "concurso": self.concurso, "freq": self.freq,
+            "ultimo": self.ultimo, "soma_gaps": self.soma_gaps, "n_gaps": self.n_gaps,
+            "freq_janelas": {str(w): c for w, c in self.freq_janelas.items()},
+            "janela": list(self.janela), "gerado": self.gerado,
+        }
+
+    @classmethod
+    def de_dict(cls, d):
+        return cls(
+            d["total"], d["concurso"], d["freq"], d["ultimo"], d["soma_gaps"], d["n_gaps"],
+            {int(w): c for w, c in d["freq_janelas"].items()}, d["janela"], d.get("gerado"),
+        )
+
+
+def construir_estado_dashboard(historico):
+    """Estado do zero a partir do histórico inteiro, com operações sobre a matriz (N x 25)."""
+    historico = DrawHistory.de_concursos(historico)
+    matriz = mascaras_para_matriz(historico.mascaras, bool)
+    total = len(matriz)
+    freq = matriz.sum(axis=0)
+
+    # última/primeira aparição: argmax da matriz invertida / direta
+    apareceu = freq > 0
+    ultimo = np.where(apareceu, total - 1 - matriz[::-1].argmax(axis=0), -1)
+    primeiro = matriz.argmax(axis=0)
+    # soma dos intervalos entre aparições = soma dos diffs das posições = último - primeiro
+    soma_gaps = np.where(freq > 1, ultimo - primeiro, 0)
+    n_gaps = np.maximum(freq - 1, 0)
+
+    return EstadoDashboard(
+        total, int(historico.ids[-1]) if total else None,
+        freq.tolist(), ultimo.tolist(), soma_gaps.tolist(), n_gaps.tolist(),
+        {w: matriz[-w:].sum(axis=0).tolist() for w in JANELAS_FREQ},
+        zip(historico.ids[-JANELA:].tolist(), historico.mascaras[-JANELA:].tolist()),
+    )
+
+
+def _frequencias(contagem):
+    return {d + 1: c for d, c in enumerate(contagem) if c}
+
+
+def salvar_estado_dashboard(estado, caminho=CAMINHO_ESTADO_DASHBOARD):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    tmp = caminho + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(estado.para_dict(), f)
+    os.replace(tmp, caminho)
+    return caminho
+
+
+def carregar_estado_dashboard(caminho=CAMINHO_ESTADO_DASHBOARD):
+    if not os.path.exists(caminho):
+        return None
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return EstadoDashboard.de_dict(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _aplicar_novos(estado, novos):
+    for concurso, mascara in zip(novos.ids.tolist(), novos.mascaras.tolist()):
+        estado.aplicar(concurso, mascara)
+
+
+def sincronizar_dashboard(historico, caminho=CAMINHO_ESTADO_DASHBOARD):
+    """Agregados do dashboard em dia com o histórico; ver sincronizar_incremental."""
+    return sincronizar_incremental(
+        historico,
+        partial(carregar_estado_dashboard, caminho),
+        construir_estado_dashboard,
+        _aplicar_novos,
+        partial(salvar_estado_dashboard, caminho=caminho),
+    )
+
+
+# --- HISTÓRICO EM BLOCOS ---
+# O painel não embute mais o histórico: aponta para blocos de BLOCO_HISTORICO
+# sorteios (ids + máscaras de 25 bits). O nome de cada arquivo é o hash do
+# conteúdo, então um bloco publicado nunca muda e pode ficar em cache para
+# sempre; só o último, ainda incompleto, ganha um nome novo a cada sorteio.
+
+BLOCO_HISTORICO = 500
+HISTORICO_SUBDIR = "historico"
+
+
+def gravar_blocos_historico(historico, diretorio, tamanho=BLOCO_HISTORICO):
+    """
+    Grava os blocos do histórico em <diretorio>/historico/ (só os que ainda não
+    existem) e apaga os que deixaram de ser referenciados.
+    Retorna a lista de descritores que vai no painel.
+    """
+    historico = DrawHistory.de_concursos(historico)
+    pasta = os.path.join(diretorio, HISTORICO_SUBDIR)
+    os.makedirs(pasta, exist_ok=True)
+    blocos = []
+    for ini in range(0, len(historico), tamanho):
+        parte = historico[ini:ini + tamanho]
+        conteudo = json.dumps(
+            {"ids": parte.ids.tolist(), "mascaras": parte.mascaras.tolist()}, separators=(",", ":")
+        ).encode("utf-8")
+        nome = f"hist_{hashlib.sha1(conteudo).hexdigest()[:16]}.json"
+        caminho = os.path.join(pasta, nome)
+        if not os.path.exists(caminho):
+            with open(caminho + ".tmp", "wb") as f:
+                f.write(conteudo)
+            os.replace(caminho + ".tmp", caminho)
+            gravar_comprimidos(caminho)
+        blocos.append({
+            "arquivo": f"{HISTORICO_SUBDIR}/{nome}",
+            "inicio": int(parte.ids[0]), "fim": int(parte.ids[-1]), "total": len(parte),
+        })
+
+    # blocos antigos e as variantes comprimidas deles (hist_<hash>.json.gz ...)
+    usados = {b["arquivo"].rsplit("/", 1)[1] for b in blocos}
+    for nome in os.listdir(pasta):
+        if nome.startswith("hist_") and nome.split(".json", 1)[0] + ".json" not in usados:
+            os.remove(os.path.join(pasta, nome))
+    return blocos
+
+
+def montar_painel(estado, rankings, blocos=()):
+    """
+    Resumo do dashboard_data.json a partir do estado agregado. O histórico
+    completo fica nos blocos (gravar_blocos_historico), carregados sob demanda.
+    """
+    (ultimo_id, ultima), (_, penultima) = estado.janela[-1], estado.janela[-2]
+    ids, matriz = estado.matriz_janela()
+    return {
+        "concurso": ultimo_id,
+        "dezenas": mascara_para_dezenas(ultima),
+        "repetidos_anterior": (ultima & penultima).bit_count(),
+        "frequencia_total": _frequencias(estado.freq),
+        "frequencia_10": _frequencias(estado.freq_janelas[10]),
+        "frequencia_50": _frequencias(estado.freq_janelas[50]),
+        "atrasos": estado.atrasos(),
+        "recurrence": estado.recorrencia(),
+        "triplets": trincas_janela(estado),
+        "stats_100": estatisticas_janela(ids, matriz),
+        "heatmap": list(estado.freq),
+        "total_concursos": estado.total,
+        "history_chunks": list(blocos),
+        "missing_cycle": estado.faltando_ciclo(),
+        "rankings": rankings,
+    }
+
+
+# --- GERAÇÃO DO PAINEL ---
+
+def carregar_rankings(ultimo_concurso, diretorio=RANKINGS_APP_DIR, tamanhos=(17, 18, 19, 20)):
+    """Rankings mais recentes de cada tamanho (até 10 concursos atrás) e os arquivos usados."""
+    rankings = {}
+    fontes = []
+    for d in tamanhos:
+        encontrado = []
+        for c in range(ultimo_concurso, ultimo_concurso - 10, -1):
+            nome = f"top10_{d}dezenas_{c}concursos.json"
+            caminho = os.path.join(diretorio, nome)
+            if os.path.exists(caminho):
+                try:
+                    with open(caminho, "r", encoding="utf-8") as f:
+                        encontrado = json.load(f)
+                    fontes.append([nome, os.stat(caminho).st_mtime_ns])
+                    break
+                except (OSError, ValueError):
+                    continue
+        rankings[str(d)] = encontrado
+    return rankings, fontes
+
+
+def caminho_estado_painel(saida):
+    """Estado dos agregados do painel gravado em `saida`: um arquivo por saída."""
+    saida = os.path.abspath(saida)
+    if saida == os.path.abspath(DASHBOARD_FILE):
+        return CAMINHO_ESTADO_DASHBOARD
+    chave = hashlib.sha1(saida.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(ESTADO_DIR, f"estado_dashboard_{chave}.json")
+
+
+def gerar_painel(historico, forcar=False, saida=DASHBOARD_FILE, rankings_dir=RANKINGS_APP_DIR,
+                 caminho_estado=None):
+    """
+    Atualiza os agregados com os sorteios novos e regrava o painel (resumo +
+    blocos do histórico) se o concurso ou os rankings mudaram desde a última
+    geração. Retorna True se o painel foi gravado, False se já estava em dia.
+    caminho_estado: estado dos agregados (padrão: caminho_estado_painel(saida)).
+    """
+    caminho_estado = caminho_estado or caminho_estado_painel(saida)
+    estado, _ = sincronizar_dashboard(historico, caminho_estado)
+    rankings, fontes = carregar_rankings(estado.concurso, rankings_dir)
+
+    assinatura = {"concurso": estado.concurso, "total": estado.total, "rankings": fontes}
+    if not forcar and estado.gerado == assinatura and os.path.exists(saida):
+        return False
+
+    # Histórico em blocos imutáveis (data/historico/); o resumo só aponta para eles
+    blocos = gravar_blocos_historico(historico, os.path.dirname(saida))
+    painel = montar_painel(estado, rankings, blocos)
+
+    tmp = saida + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(painel, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, saida)
+    gravar_comprimidos(saida)
+
+    estado.gerado = assinatura
+    salvar_estado_dashboard(estado, caminho_estado)
+    return True
@@ -1,7 +1,100 @@
 import csv
 import json
 import os
-from .config import CSV_FILE, CACHE_FILE
+import struct
+from datetime import date, datetime
+import numpy as np
+from .config import CSV_FILE, CACHE_FILE, HISTORY_FILE, JOURNAL_FILE
+from .logic import dezenas_para_mascara, mascara_para_dezenas
+from .batch import popcount32
+
+
+def data_para_ordinal(data_str):
+    """'dd/mm/aaaa' -> ordinal do calendário (0 se vazia ou inválida)."""
+    try:
+        return datetime.strptime(data_str, "%d/%m/%Y").toordinal()
+    except (TypeError, ValueError):
+        return 0
+
+
+def ordinal_para_data(ordinal):
+    return date.fromordinal(ordinal).strftime("%d/%m/%Y") if ordinal > 0 else ""
+
+
+class DrawHistory:
+    """
+    Histórico de concursos ordenado por id (mais antigo primeiro) em arrays
+    contíguos: ids (int32), ordinais de data (int32) e máscaras de 25 bits (uint32).
+    Fatias (h[-50:], h.ultimos(100)) são views sobre os mesmos arrays, sem cópia.
+    Iterar ou indexar com int devolve (id, data_str, frozenset), o mesmo
+    formato das listas de concursos.
+    """
+    __slots__ = ("ids", "ordinais", "mascaras")
+
+    def __init__(self, ids, ordinais, mascaras, ordenado=False):
+        ids = np.asarray(ids, dtype=np.int32)
+        ordinais = np.asarray(ordinais, dtype=np.int32)
+        mascaras = np.asarray(mascaras, dtype=np.uint32)
+        if not ordenado:
+            ordem = np.argsort(ids, kind="stable")
+            ids, ordinais, mascaras = ids[ordem], ordinais[ordem], mascaras[ordem]
+        self.ids = ids
+        self.ordinais = ordinais
+        self.mascaras = mascaras
+
+    @classmethod
+    def de_concursos(cls, concursos):
+        """Constrói a partir de uma lista de (id, data_str, dezenas)."""
+        if isinstance(concursos, cls):
+            return concursos
+        concursos = list(concursos)
+        return cls(
+            [c for c, _, _ in concursos],
+            [data_para_ordinal(d) for _, d, _ in concursos],
+            [dezenas_para_mascara(dz) for _, _, dz in concursos],
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _item(self, i):
+        return (int(self.ids[i]), ordinal_para_data(int(self.ordinais[i])),
+                frozenset(mascara_para_dezenas(int(self.mascaras[i]))))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            if i.step not in (None, 1):
+                raise ValueError("DrawHistory só aceita fatias contíguas.")
+            return DrawHistory(self.ids[i], self.ordinais[i], self.mascaras[i], ordenado=True)
+        return self._item(i)
+
+    def __iter__(self):
+        return (self._item(i) for i in range(len(self)))
+
+    def __reversed__(self):
+        return (self._item(i) for i in range(len(self) - 1, -1, -1))
+
+    def __repr__(self):
+        if not len(self):
+            return "DrawHistory(vazio)"
+        return f"DrawHistory({len(self)} concursos, {self.ids[0]}..{self.ids[-1]})"
+
+    def ultimos(self, n):
+        """View dos n concursos mais recentes."""
+        return self[max(len(self) - n, 0):]
+
+    def indice(self, concurso_id):
+        """Posição do concurso no histórico, ou None se ausente."""
+        i = int(np.searchsorted(self.ids, concurso_id))
+        if i < len(self) and self.ids[i] == concurso_id:
+            return i
+        return None
+
+    def por_concurso(self, concurso_id):
+        """(id, data_str, frozenset) do concurso, ou None se ausente."""
+        i = self.indice(concurso_id)
+        return None if i is None else self._item(i)
+
 
 def carregar_csv():
     """Carrega dados do arquivo CSV."""
@@ -31,9 +124,208 @@ def carregar_json():
         # Convert back to standard format: (id, data, dezenas_set)
         return [(d["concurso"], d["data"], frozenset(d["dezenas"])) for d in data]
 
+# --- ARQUIVO BINÁRIO DO HISTÓRICO ---
+# Cabeçalho de 16 bytes (magic, versão, tamanho do registro) seguido de
+# registros fixos de 12 bytes: concurso (int32), ordinal da data (int32) e
+# máscara de 25 bits (uint32). A quantidade de registros sai do tamanho do
+# arquivo, então anexar um concurso é só um write no fim.
+
+BIN_MAGIC = b"LTFH"
+BIN_VERSAO = 1
+BIN_CABECALHO = struct.Struct("<4sHH8x")
+BIN_REGISTRO = np.dtype([("concurso", "<i4"), ("ordinal", "<i4"), ("mascara", "<u4")])
+
+
+# Limite de plausibilidade do id de um registro decodificado; fora dele (ou
+# sem 15 dezenas) o registro é lixo de um write cortado. A data não entra:
+# ordinal 0 é "data desconhecida" (data_para_ordinal).
+CONCURSO_MAXIMO = 100_000
+
+
+def _cabecalho_binario():
+    return BIN_CABECALHO.pack(BIN_MAGIC, BIN_VERSAO, BIN_REGISTRO.itemsize)
+
+
+def _registros(historico):
+    registros = np.empty(len(historico), dtype=BIN_REGISTRO)
+    registros["concurso"] = historico.ids
+    registros["ordinal"] = historico.ordinais
+    registros["mascara"] = historico.mascaras
+    return registros
+
+
+def _alinhar(f, inicio):
+    """
+    Trunca o arquivo aberto `f` para um número inteiro de registros depois de
+    `inicio` bytes, descartando um registro cortado no fim. Retorna o tamanho final.
+    """
+    tamanho = os.fstat(f.fileno()).st_size
+    excesso = max(tamanho - inicio, 0) % BIN_REGISTRO.itemsize
+    if excesso:
+        os.ftruncate(f.fileno(), tamanho - excesso)
+    return tamanho - excesso
+
+
+def _plausiveis(registros):
+    """Só os registros com id plausível e 15 dezenas."""
+    mascaras = registros["mascara"]
+    validos = (
+        (registros["concurso"] >= 1) & (registros["concurso"] <= CONCURSO_MAXIMO)
+        & (mascaras < (1 << 25)) & (popcount32(mascaras) == 15)
+    )
+    return registros if validos.all() else registros[validos]
+
+
+def salvar_binario(historico, caminho=HISTORY_FILE):
+    """Grava o histórico inteiro no formato binário (troca atômica do arquivo)."""
+    historico = DrawHistory.de_concursos(historico)
+    tmp = caminho + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_cabecalho_binario())
+        f.write(_registros(historico).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, caminho)
+    return caminho
+
+
+def anexar_binario(concurso, data_str, dezenas, caminho=HISTORY_FILE):
+    """Anexa um concurso ao fim do arquivo binário (O(1))."""
+    registro = np.array(
+        [(concurso, data_para_ordinal(data_str), dezenas_para_mascara(dezenas))], dtype=BIN_REGISTRO
+    )
+    with open(caminho, "ab") as f:
+        tamanho = os.fstat(f.fileno()).st_size
+        if tamanho < BIN_CABECALHO.size:
+            # vazio ou cabeçalho cortado: recomeça o arquivo
+            os.ftruncate(f.fileno(), 0)
+            f.write(_cabecalho_binario())
+        else:
+            _alinhar(f, BIN_CABECALHO.size)
+        f.write(registro.tobytes())
+
+
+def carregar_binario(caminho=HISTORY_FILE):
+    """Mapeia o arquivo binário em memória e devolve um DrawHistory (None se não existir)."""
+    if not os.path.exists(caminho) or os.path.getsize(caminho) < BIN_CABECALHO.size:
+        return None
+    with open(caminho, "rb") as f:
+        magic, versao, tam_registro = BIN_CABECALHO.unpack(f.read(BIN_CABECALHO.size))
+    if magic != BIN_MAGIC or versao != BIN_VERSAO or tam_registro != BIN_REGISTRO.itemsize:
+        raise ValueError(f"Arquivo de histórico inválido: {caminho}")
+
+    if (os.path.getsize(caminho) - BIN_CABECALHO.size) % BIN_REGISTRO.itemsize:
+        try:
+            with open(caminho, "r+b") as f:
+                _alinhar(f, BIN_CABECALHO.size)
+        except OSError:
+            pass
+    total = (os.path.getsize(caminho) - BIN_CABECALHO.size) // BIN_REGISTRO.itemsize
+    if total == 0:
+        return DrawHistory([], [], [], ordenado=True)
+    registros = _plausiveis(
+        np.memmap(caminho, dtype=BIN_REGISTRO, mode="r", offset=BIN_CABECALHO.size, shape=(total,))
+    )
+    ids = np.ascontiguousarray(registros["concurso"])
+    ordenado = bool(np.all(ids[1:] > ids[:-1]))
+    return DrawHistory(
+        ids, np.ascontiguousarray(registros["ordinal"]), np.ascontiguousarray(registros["mascara"]),
+        ordenado=ordenado,
+    )
+
+
+# --- JOURNAL APPEND-ONLY ---
+# Concursos novos entram num journal (mesmos registros de 12 bytes, sem
+# cabeçalho) em vez de regravar o snapshot: ingerir um sorteio custa um
+# write + fsync. Na leitura, snapshot e journal são mesclados; quando o
+# journal passa de JOURNAL_LIMITE registros, vira um snapshot novo (troca
+# atômica) e é truncado. Um registro cortado no fim (processo morto no meio
+# do write) é descartado com ftruncate antes do próximo append e na leitura,
+# para que os registros seguintes não fiquem desalinhados; registros com
+# valores implausíveis são ignorados.
+
+JOURNAL_LIMITE = 64
+
+
+def anexar_journal(concurso, data_str, dezenas, caminho=JOURNAL_FILE):
+    """Anexa um concurso ao journal e força o registro para o disco."""
+    registro = np.array(
+        [(concurso, data_para_ordinal(data_str), dezenas_para_mascara(dezenas))], dtype=BIN_REGISTRO
+    )
+    with open(caminho, "ab") as f:
+        _alinhar(f, 0)
+        f.write(registro.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def carregar_journal(caminho=JOURNAL_FILE):
+    """Registros do journal (array estruturado BIN_REGISTRO), na ordem em que foram anexados."""
+    if not os.path.exists(caminho):
+        return np.empty(0, dtype=BIN_REGISTRO)
+    if os.path.getsize(caminho) % BIN_REGISTRO.itemsize:
+        try:
+            with open(caminho, "r+b") as f:
+                _alinhar(f, 0)
+        except OSError:
+            pass
+    with open(caminho, "rb") as f:
+        dados = f.read()
+    completos = len(dados) // BIN_REGISTRO.itemsize * BIN_REGISTRO.itemsize
+    return _plausiveis(np.frombuffer(dados[:completos], dtype=BIN_REGISTRO))
+
+
+def _mesclar(historico, journal):
+    """Snapshot + journal; no caso de id repetido, vale o registro mais recente."""
+    if historico is None:
+        historico = DrawHistory([], [], [], ordenado=True)
+    if not len(journal):
+        return historico
+    ids = np.concatenate((historico.ids, journal["concurso"]))
+    ordinais = np.concatenate((historico.ordinais, journal["ordinal"]))
+    mascaras = np.concatenate((historico.mascaras, journal["mascara"]))
+    # último registro de cada id: unique sobre os ids invertidos
+    _, pos = np.unique(ids[::-1], return_index=True)
+    manter = len(ids) - 1 - pos
+    return DrawHistory(ids[manter], ordinais[manter], mascaras[manter], ordenado=True)
+
+
+def compactar_historico(historico=None, caminho=HISTORY_FILE, journal=JOURNAL_FILE):
+    """
+    Grava snapshot + journal num snapshot novo (troca atômica) e só então
+    trunca o journal. Se o processo cair entre os dois passos, os registros
+    repetidos do journal são descartados na próxima mescla.
+    """
+    if historico is None:
+        historico = _mesclar(carregar_binario(caminho), carregar_journal(journal))
+    salvar_binario(historico, caminho)
+    if os.path.exists(journal):
+        os.truncate(journal, 0)
+    return historico
+
+
 def carregar_dados():
-    """Tenta carregar do JSON (mais rápido), senão vai pro CSV."""
-    dados = carregar_json()
-    if not dados:
-        dados = carregar_csv()
-    return dados
+    """
+    Carrega o histórico como DrawHistory a partir do binário mapeado em memória
+    (fonte canônica) mesclado com o journal. Sem binário, importa do JSON ou do
+    CSV e grava o binário.
+    """
+    historico = carregar_binario()
+    journal = carregar_journal()
+    if len(journal):
+        historico = _mesclar(historico, journal)
+        if len(journal) >= JOURNAL_LIMITE:
+            try:
+                compactar_historico(historico)
+            except OSError:
+                pass
+    if historico is not None and len(historico):
+        return historico
+
+    historico = DrawHistory.de_concursos(carregar_json() or carregar_csv())
+    if len(historico):
+        try:
+            salvar_binario(historico)
+        except OSError:
+            pass
+    return historico
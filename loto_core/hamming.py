@@ -0,0 +1,77 @@
+"""
+Histograma de acertos de TODOS os subconjuntos de {1..25} via transformada
+de Walsh–Hadamard.
+
+Como todo sorteio tem o mesmo tamanho m (15), acertos e distância de Hamming
+se determinam: dist(x, d) = |x| + m - 2 * |x & d|. Contar, para cada x, os
+sorteios a distância j é uma convolução XOR do histograma dos sorteios com o
+indicador dos vetores de peso j, cuja transformada é o polinômio de
+Krawtchouk K_j(|s|). Cada distância custa uma transformada de 2^25 pontos,
+independente do tamanho do histórico.
+"""
+from math import comb
+import numpy as np
+from .batch import FAIXAS, PESOS_ARRAY, para_mascaras, popcount32
+from .ranking import combinacoes_mascaras
+
+
+def transformada_walsh(valores):
+    """Transformada de Walsh–Hadamard (sem normalização), in-place, em um array de 2^n."""
+    n = len(valores).bit_length() - 1
+    for i in range(n):
+        blocos = valores.reshape(-1, 2, 1 << i)
+        a = blocos[:, 0, :]
+        b = blocos[:, 1, :]
+        a += b      # a + b
+        b *= -2
+        b += a      # (a + b) - 2b = a - b
+    return valores
+
+
+def krawtchouk(j, n):
+    """K_j(w; n) para w = 0..n, como array int64."""
+    return np.array([
+        sum((-1) ** i * comb(w, i) * comb(n - w, j - i) for i in range(j + 1))
+        for w in range(n + 1)
+    ], dtype=np.int64)
+
+
+def histograma_acertos(mascaras, tamanhos=(15, 17, 18, 19, 20), acertos=FAIXAS, n=25):
+    """
+    Para cada tamanho k, matriz (C(n,k) x len(acertos)) com quantos sorteios
+    tiveram exatamente h acertos com cada combinação. As linhas seguem a
+    ordem de combinacoes_mascaras(k, n).
+    """
+    mascaras = para_mascaras(mascaras)
+    tamanho_sorteio = int(popcount32(mascaras[:1])[0])
+    if np.any(popcount32(mascaras) != tamanho_sorteio):
+        raise ValueError("Todos os sorteios precisam ter a mesma quantidade de dezenas.")
+
+    espectro = transformada_walsh(np.bincount(mascaras, minlength=1 << n).astype(np.int64))
+    pesos = popcount32(np.arange(1 << n, dtype=np.uint32))
+
+    combos = {k: combinacoes_mascaras(k, n) for k in tamanhos}
+    saida = {k: np.zeros((len(combos[k]), len(acertos)), dtype=np.int32) for k in tamanhos}
+
+    # distância -> [(tamanho, coluna)] que ela alimenta
+    por_distancia = {}
+    for k in tamanhos:
+        for col, h in enumerate(acertos):
+            if max(0, k + tamanho_sorteio - n) <= h <= min(k, tamanho_sorteio):
+                por_distancia.setdefault(k + tamanho_sorteio - 2 * h, []).append((k, col))
+
+    for j, destinos in sorted(por_distancia.items()):
+        contagem = transformada_walsh(espectro * krawtchouk(j, n)[pesos])
+        contagem >>= n  # a inversa é a própria transformada dividida por 2^n (exata)
+        for k, col in destinos:
+            saida[k][:, col] = contagem[combos[k]]
+    return saida
+
+
+def scores_espectrais(mascaras, tamanho, n=25):
+    """
+    Scores PESOS e contagens 11..15 de todas as combinações de `tamanho`
+    dezenas, alinhados com combinacoes_mascaras(tamanho).
+    """
+    contagens = histograma_acertos(mascaras, (tamanho,), FAIXAS, n)[tamanho]
+    return contagens @ PESOS_ARRAY, contagens
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+from .config import API_CAIXA
+
+# --- DOWNLOAD CONCORRENTE DA API DA CAIXA ---
+# Cada thread do pool mantém a própria requests.Session (conexão keep-alive
+# reaproveitada); o asyncio limita quantos downloads ficam em voo e devolve
+# os resultados na mesma ordem dos números pedidos.
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+ESPERA_MAXIMA = 60.0
+
+
+def extrair_concurso(d):
+    """(concurso, data_str, dezenas_ordenadas) a partir do JSON da API, ou None."""
+    if not d or not d.get("numero"):
+        return None
+    if d.get("dezenasSorteadasOrdemSorteio"):
+        dezenas = [int(n) for n in d["dezenasSorteadasOrdemSorteio"]]
+    elif d.get("listaDezenas"):
+        dezenas = [int(n) for n in d["listaDezenas"]]
+    else:
+        dezenas = [int(d[f"dezena{i}"]) for i in range(1, 16) if d.get(f"dezena{i}")]
+    if len(dezenas) != 15:
+        return None
+    return int(d["numero"]), d.get("dataApuracao", ""), sorted(dezenas)
+
+
+def _retry_after(valor):
+    """Segundos pedidos pelo header Retry-After (número ou data HTTP), ou None."""
+    if not valor:
+        return None
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Sessoes(threading.local):
+    def __init__(self):
+        self.sessao = requests.Session()
+        self.sessao.headers.update(HEADERS)
+        self.sessao.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self.sessao.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+
+def _requisitar(sessoes, url, timeout):
+    """
+    Uma tentativa de GET (roda numa thread do pool).
+    Retorna ("ok", json) | ("fim", None) | ("repetir", segundos_ou_None).
+    """
+    try:
+        r = sessoes.sessao.get(url, timeout=timeout)
+    except requests.RequestException:
+        return "repetir", None
+    if r.status_code == 200:
+        try:
+            return "ok", r.json()
+        except ValueError:
+            return "repetir", None
+    if r.status_code == 429 or r.status_code >= 500:
+        return "repetir", _retry_after(r.headers.get("Retry-After"))
+    return "fim", None
+
+
+async def baixar_concursos_async(numeros, concorrencia=8, tentativas=4, espera_base=0.5,
+                                 timeout=10, base_url=API_CAIXA):
+    """
+    Baixa vários concursos com no máximo `concorrencia` requisições em voo,
+    repetindo falhas transitórias (erro de rede, 429, 5xx) com backoff
+    exponencial ou o Retry-After do servidor.
+    Retorna uma lista na ordem de `numeros` com (concurso, data, dezenas) ou None.
+    Um número vazio/None busca o concurso mais recente.
+    """
+    loop = asyncio.get_running_loop()
+    limite = asyncio.Semaphore(concorrencia)
+    sessoes = _Sessoes()
+
+    async def baixar(numero):
+        url = base_url.format(numero if numero else "")
+        async with limite:
+            for tentativa in range(tentativas):
+                status, valor = await loop.run_in_executor(pool, _requisitar, sessoes, url, timeout)
+                if status == "ok":
+                    return extrair_concurso(valor)
+                if status == "fim":
+                    return None
+                if tentativa + 1 < tentativas:
+                    espera = valor if valor is not None else espera_base * 2 ** tentativa
+                    await asyncio.sleep(min(espera, ESPERA_MAXIMA))
+        return None
+
+    with ThreadPoolExecutor(max_workers=concorrencia) as pool:
+        return await asyncio.gather(*(baixar(n) for n in numeros))
+
+
+def baixar_concursos(numeros, **kwargs):
+    """Versão síncrona de baixar_concursos_async."""
+    return asyncio.run(baixar_concursos_async(list(numeros), **kwargs))
+
+
+def baixar_ultimo(**kwargs):
+    """Concurso mais recente da API como (concurso, data, dezenas), ou None."""
+    return baixar_concursos([None], **kwargs)[0]
@@ -0,0 +1,75 @@
+import numpy as np
+from .batch import mascaras_para_matriz
+from .data import DrawHistory
+
+# --- ÍNDICE INVERTIDO POR DEZENA ---
+# Para cada dezena, um bitset (int do Python) sobre as posições dos sorteios:
+# o bit i está ligado se a dezena saiu no i-ésimo sorteio do histórico.
+# "Sorteios com todas as dezenas de S" é o AND de |S| bitsets, e a contagem
+# é um bit_count; as parceiras saem de mais 25 ANDs.
+
+
+class IndiceInvertido:
+    """Bitsets de posições de sorteio por dezena (índice 0 = dezena 1)."""
+    __slots__ = ("bitsets", "ids", "total")
+
+    def __init__(self, bitsets, ids):
+        self.bitsets = list(bitsets)
+        self.ids = np.asarray(ids, dtype=np.int32)
+        self.total = len(self.ids)
+
+    @classmethod
+    def de_historico(cls, historico):
+        historico = DrawHistory.de_concursos(historico)
+        matriz = mascaras_para_matriz(historico.mascaras, bool)
+        bitsets = [
+            int.from_bytes(np.packbits(matriz[:, d], bitorder="little").tobytes(), "little")
+            for d in range(25)
+        ]
+        return cls(bitsets, historico.ids)
+
+    def aplicar(self, concurso, dezenas):
+        """Acrescenta um sorteio novo no fim do índice."""
+        bit = 1 << self.total
+        for d in dezenas:
+            self.bitsets[d - 1] |= bit
+        self.ids = np.append(self.ids, np.int32(concurso))
+        self.total += 1
+
+    def sorteios_com(self, dezenas):
+        """Bitset dos sorteios que contêm todas as `dezenas` (todos, se vazio)."""
+        bits = (1 << self.total) - 1
+        for d in dezenas:
+            bits &= self.bitsets[d - 1]
+        return bits
+
+    def contar(self, dezenas):
+        """Quantos sorteios contêm todas as `dezenas`."""
+        return self.sorteios_com(dezenas).bit_count()
+
+    def parceiras(self, dezenas):
+        """
+        (total, {dezena: vezes}) — quantos sorteios contêm `dezenas` e, entre
+        eles, quantas vezes cada outra dezena saiu junto (só as que saíram).
+        As chaves vêm na ordem da primeira aparição conjunta (sorteio mais
+        antigo, depois a dezena), a mesma de um Counter montado percorrendo
+        o histórico; uma ordenação estável por vezes mantém esse desempate.
+        """
+        base = self.sorteios_com(dezenas)
+        alvo = set(dezenas)
+        primeira = {}
+        for d in range(1, 26):
+            if d not in alvo:
+                juntas = base & self.bitsets[d - 1]
+                if juntas:
+                    primeira[d] = ((juntas & -juntas).bit_length(), juntas.bit_count())
+        ordem = sorted(primeira, key=lambda d: primeira[d][0])
+        return base.bit_count(), {d: primeira[d][1] for d in ordem}
+
+    def concursos(self, bits):
+        """Ids dos concursos marcados num bitset de posições."""
+        if not bits:
+            return []
+        bytes_ = np.frombuffer(bits.to_bytes((self.total + 7) // 8, "little"), dtype=np.uint8)
+        posicoes = np.flatnonzero(np.unpackbits(bytes_, bitorder="little")[:self.total])
+        return self.ids[posicoes].tolist()
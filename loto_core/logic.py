@@ -1,24 +1,92 @@
 from .config import PESOS
 import math
 
+# --- REPRESENTAÇÃO EM BITMASK (25 bits) ---
+# A dezena n ocupa o bit (n - 1): {1, 3} -> 0b101. Interseção vira um AND e
+# contagem de acertos vira popcount, sem alocar sets a cada comparação.
+
+TODAS_DEZENAS = (1 << 25) - 1
+
+
+def dezenas_para_mascara(dezenas):
+    """Converte um iterável de dezenas (1..25) na máscara de 25 bits."""
+    mascara = 0
+    for n in dezenas:
+        mascara |= 1 << (n - 1)
+    return mascara
+
+
+def mascara_para_dezenas(mascara):
+    """Converte uma máscara de 25 bits na lista ordenada de dezenas."""
+    return [n for n in range(1, 26) if mascara >> (n - 1) & 1]
+
+
+def contar_acertos_mascara(jogo_mask, sorteio_mask):
+    """Quantidade de dezenas em comum entre duas máscaras (popcount do AND)."""
+    return (jogo_mask & sorteio_mask).bit_count()
+
+
+def calcular_score_mascara(jogo_mask, mascaras):
+    """
+    Versão em máscara de `calcular_score`.
+    jogo_mask: máscara do jogo
+    mascaras: DrawHistory, array ou sequência de máscaras dos sorteios
+    """
+    acertos = bytes(map(int.bit_count, map(int(jogo_mask).__and__, _mascaras_de(mascaras))))
+    ct = {f: acertos.count(f) for f in (11, 12, 13, 14, 15)}
+    score = sum(ct[f] * PESOS[f] for f in PESOS)
+    return score, ct
+
+
+def calcular_atraso_mascara(jogo_mask, mascaras, ponto_minimo):
+    """
+    Versão em máscara de `calcular_atraso`.
+    mascaras: DrawHistory, array ou sequência de máscaras dos sorteios em
+    ordem cronológica (mais antigo primeiro)
+    Retorna (atraso_count, acertos_no_ultimo); atraso = len(mascaras) se nunca acertou.
+    """
+    jogo_mask = int(jogo_mask)
+    mascaras = _mascaras_de(mascaras)
+    for i, d in enumerate(reversed(mascaras)):
+        acertos = (jogo_mask & d).bit_count()
+        if acertos >= ponto_minimo:
+            return i, acertos
+    return len(mascaras), 0
+
+
+def _como_mascara(jogo):
+    return jogo if isinstance(jogo, int) else dezenas_para_mascara(jogo)
+
+
+def _mascaras_de(concursos):
+    """
+    Máscaras (lista de int) de um DrawHistory (já ordenado), de um array de
+    máscaras, de uma lista de máscaras ou de uma lista de (id, data, dezenas).
+    """
+    if hasattr(concursos, "mascaras"):
+        return concursos.mascaras.tolist()
+    if hasattr(concursos, "tolist"):
+        return concursos.tolist()
+    concursos = concursos if isinstance(concursos, list) else list(concursos)
+    if not concursos or isinstance(concursos[0], int):
+        return concursos
+    return [dezenas_para_mascara(d) for _, _, d in concursos]
+
+
+# --- API EM FROZENSET (wrappers sobre as máscaras) ---
+
 def calcular_acertos(jogo, sorteio_dezenas):
     """Calcula quantos números do jogo estão no sorteio."""
-    return len(jogo & sorteio_dezenas)
+    return contar_acertos_mascara(_como_mascara(jogo), _como_mascara(sorteio_dezenas))
 
 def calcular_score(jogo_set, concursos):
     """
     Calcula o score de uma combinação baseado em pesos históricos.
     jogo_set: frozenset das dezenas do jogo
-    concursos: lista de (id, data, dezenas_set)
+    concursos: DrawHistory ou lista de (id, data, dezenas_set)
     """
-    ct = {11: 0, 12: 0, 13: 0, 14: 0, 15: 0}
-    for _, _, d in concursos:
-        acertos = len(d & jogo_set)
-        if acertos >= 11:
-            ct[acertos] += 1
-    
-    score = sum(ct[f] * PESOS[f] for f in PESOS)
-    return score, ct
+    mascaras = _mascaras_de(concursos)
+    return calcular_score_mascara(_como_mascara(jogo_set), mascaras)
 
 
 def calcular_atraso(jogo_set, concursos, ponto_minimo):
@@ -26,14 +94,17 @@ def calcular_atraso(jogo_set, concursos, ponto_minimo):
     Calcula o atraso (quantos concursos desde o último acerto >= ponto_minimo).
     Retorna (atraso_count, ultimo_concurso_id, acertos_no_ultimo)
     """
-    concursos_ordenados = sorted(concursos, key=lambda x: x[0], reverse=True)
-    
-    for i, (cid, data, d) in enumerate(concursos_ordenados):
-        acertos = len(d & jogo_set)
-        if acertos >= ponto_minimo:
-            return i, cid, acertos
-            
-    return len(concursos), None, 0
+    if hasattr(concursos, "mascaras"):
+        ids = concursos.ids
+    else:
+        concursos = sorted(concursos, key=lambda x: x[0])
+        ids = [c for c, _, _ in concursos]
+    mascaras = _mascaras_de(concursos)
+
+    atraso, acertos = calcular_atraso_mascara(_como_mascara(jogo_set), mascaras, ponto_minimo)
+    if atraso == len(mascaras):
+        return atraso, None, 0
+    return atraso, int(ids[-1 - atraso]), acertos
 
 # --- NOVOS FILTROS ESTATÍSTICOS (SUPER ALGORITMO) ---
 
@@ -0,0 +1,139 @@
+"""
+Modelo nulo por Monte Carlo: sorteios aleatórios uniformes de 15 dezenas.
+
+Um sorteio é um índice uniforme em [0, C(25, 15)) aplicado à tabela
+combinacoes_mascaras(15), sem rejeição nem embaralhamento. Um portfólio fixo
+de jogos é conferido contra os sorteios em lotes (jogos x sorteios) com
+popcount, acumulando só os histogramas de acertos: por par (jogo, sorteio) e
+do melhor jogo de cada sorteio.
+
+Reprodutibilidade: a simulação é dividida em blocos de tamanho fixo e cada
+bloco usa seu próprio Generator, filho de SeedSequence(semente). O resultado
+depende só de (jogos, n, semente, bloco), não do número de processos.
+"""
+from math import comb, sqrt
+from statistics import NormalDist
+import numpy as np
+from .backtest import PREMIOS_MEDIOS
+from .batch import FAIXAS, popcount32, para_mascaras, mascaras_para_matriz
+from .parallel import mapear
+from .ranking import combinacoes_mascaras
+
+TOTAL_SORTEIOS = comb(25, 15)
+BLOCO_SIMULACAO = 1 << 20
+
+_combinacoes = None
+
+
+def _combinacoes_15():
+    global _combinacoes
+    if _combinacoes is None:
+        _combinacoes = combinacoes_mascaras(15)
+    return _combinacoes
+
+
+def _gerador(rng):
+    return rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+
+
+def sorteios_aleatorios(n, rng=None, matriz=False):
+    """n sorteios uniformes: máscaras uint32 ou, com matriz=True, matriz bool (n x 25)."""
+    mascaras = np.take(_combinacoes_15(), _gerador(rng).integers(0, TOTAL_SORTEIOS, n))
+    return mascaras_para_matriz(mascaras, bool) if matriz else mascaras
+
+
+def probabilidade_exata(tamanho, acertos):
+    """P(um jogo de `tamanho` dezenas fazer exatamente `acertos` num sorteio)."""
+    return comb(tamanho, acertos) * comb(25 - tamanho, 15 - acertos) / TOTAL_SORTEIOS
+
+
+def intervalo_wilson(sucessos, total, confianca=0.95):
+    """Intervalo de Wilson para uma proporção."""
+    if not total:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confianca / 2)
+    p = sucessos / total
+    den = 1 + z * z / total
+    centro = (p + z * z / (2 * total)) / den
+    raio = z * sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / den
+    return max(0.0, centro - raio), min(1.0, centro + raio)
+
+
+def _conferir(jogos, sorteios, acertos, melhor):
+    """Acumula os histogramas de acertos de jogos x sorteios (sub-lotes que cabem no cache)."""
+    passo = max(4096, (1 << 19) // len(jogos))
+    for ini in range(0, len(sorteios), passo):
+        bloco = sorteios[ini:ini + passo]
+        pares = jogos[:, None] & bloco[None, :]
+        if hasattr(np, "bitwise_count"):
+            h = np.empty(pares.shape, dtype=np.uint8)
+            np.bitwise_count(pares, out=h, casting="unsafe")
+        else:
+            h = popcount32(pares)
+        acertos += np.bincount(h.ravel(), minlength=16)
+        melhor += np.bincount(h.max(axis=0), minlength=16)
+
+
+def _simular_bloco(jogos, tarefa):
+    semente, n = tarefa
+    acertos = np.zeros(16, dtype=np.int64)
+    melhor = np.zeros(16, dtype=np.int64)
+    _conferir(jogos, sorteios_aleatorios(n, np.random.default_rng(semente)), acertos, melhor)
+    return acertos, melhor
+
+
+class ResultadoSimulacao:
+    """
+    acertos[h]: pares (jogo, sorteio) com h acertos; melhor[h]: sorteios em
+    que o melhor jogo do portfólio fez h acertos.
+    """
+    __slots__ = ("sorteios", "tamanhos", "acertos", "melhor", "semente")
+
+    def __init__(self, sorteios, tamanhos, acertos, melhor, semente):
+        self.sorteios = sorteios
+        self.tamanhos = tamanhos        # dezenas de cada jogo
+        self.acertos = acertos
+        self.melhor = melhor
+        self.semente = semente          # entropia da SeedSequence (para repetir)
+
+    def frequencias(self, confianca=0.95, faixas=FAIXAS):
+        """
+        {faixa: {"por_jogo": (p, inf, sup), "melhor": (p, inf, sup), "exata": p}}
+        "exata" é a probabilidade teórica média por jogo, para comparação.
+        """
+        pares = self.sorteios * len(self.tamanhos)
+        saida = {}
+        for f in faixas:
+            pj = int(self.acertos[f]) / pares if pares else 0.0
+            pm = int(self.melhor[f]) / self.sorteios if self.sorteios else 0.0
+            saida[f] = {
+                "por_jogo": (pj, *intervalo_wilson(int(self.acertos[f]), pares, confianca)),
+                "melhor": (pm, *intervalo_wilson(int(self.melhor[f]), self.sorteios, confianca)),
+                "exata": float(np.mean([probabilidade_exata(t, f) for t in self.tamanhos])),
+            }
+        return saida
+
+    def premio_medio(self, premios=PREMIOS_MEDIOS):
+        """Prêmio médio do portfólio por sorteio."""
+        total = sum(int(self.acertos[p]) * v for p, v in premios.items())
+        return total / self.sorteios if self.sorteios else 0.0
+
+
+def simular(jogos, n, semente=None, processos=1, bloco=BLOCO_SIMULACAO):
+    """
+    Confere um portfólio fixo contra n sorteios aleatórios.
+    processos > 1 distribui os blocos entre processos (mesmo resultado).
+    """
+    jogos = para_mascaras(jogos)
+    if not len(jogos):
+        raise ValueError("Portfólio vazio.")
+    seq = np.random.SeedSequence(semente)
+    tamanhos = popcount32(jogos).tolist()
+    n_blocos = -(-n // bloco)
+    tarefas = [(filha, min(bloco, n - i * bloco)) for i, filha in enumerate(seq.spawn(n_blocos))]
+
+    parciais = list(mapear(_simular_bloco, tarefas, jogos, processos))
+
+    acertos = sum((a for a, _ in parciais), np.zeros(16, dtype=np.int64))
+    melhor = sum((m for _, m in parciais), np.zeros(16, dtype=np.int64))
+    return ResultadoSimulacao(n, tamanhos, acertos, melhor, seq.entropy)
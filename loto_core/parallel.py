@@ -0,0 +1,51 @@
+"""
+Distribuição de tarefas entre processos.
+
+Os módulos pesados (ranking, estado, backtest, Monte Carlo, cobertura e
+fechamentos) seguem o mesmo padrão: os dados grandes vão uma vez para cada
+worker pelo inicializador do pool, e as tarefas só carregam índices ou
+blocos pequenos. A função recebe os dados explicitamente, funcao(dados,
+tarefa); com um processo só ela roda aqui mesmo, sem estado global, então o
+caminho serial pode ser chamado de várias threads ao mesmo tempo.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+_worker = None  # (funcao, dados) do processo worker
+
+
+def processos_disponiveis(processos=None):
+    """Quantidade de processos a usar: o pedido ou, com None/0, todos os núcleos."""
+    return processos or os.cpu_count() or 1
+
+
+def _iniciar_worker(funcao, dados, preparar):
+    global _worker
+    _worker = (funcao, preparar(dados) if preparar is not None else dados)
+
+
+def _executar(tarefa):
+    funcao, dados = _worker
+    return funcao(dados, tarefa)
+
+
+def mapear(funcao, tarefas, dados=None, processos=None, preparar=None, chunksize=1):
+    """
+    funcao(dados, tarefa) para cada tarefa, em ordem, como iterador. Usa no
+    máximo um processo por tarefa. preparar(dados), se dado, roda uma vez por
+    processo (ex.: montar uma tabela grande em vez de enviá-la). Fechar o
+    iterador antes do fim cancela as tarefas pendentes.
+    """
+    tarefas = list(tarefas)
+    processos = min(processos_disponiveis(processos), max(len(tarefas), 1))
+    if processos == 1:
+        dados = preparar(dados) if preparar is not None else dados
+        for tarefa in tarefas:
+            yield funcao(dados, tarefa)
+        return
+
+    ex = ProcessPoolExecutor(processos, initializer=_iniciar_worker, initargs=(funcao, dados, preparar))
+    try:
+        yield from ex.map(_executar, tarefas, chunksize=chunksize)
+    finally:
+        ex.shutdown(cancel_futures=True)
@@ -0,0 +1,112 @@
+import threading
+import numpy as np
+from .ingest import baixar_ultimo
+from .store import carregar_historico, reparar_lacunas, atualizar_derivados, assinatura_fonte
+from .dashboard import gerar_painel
+
+# --- PIPELINE DE ATUALIZAÇÃO EM PROCESSO ---
+# Substitui os subprocessos atualizar_concursos.py + consolidar_dados.py para
+# quem roda continuamente (serve_app): o histórico fica carregado entre as
+# execuções e a primeira etapa é só uma consulta ao concurso mais recente da
+# API. Se ele já está no histórico, nada mais é feito.
+
+
+class PipelineAtualizacao:
+    """Histórico quente em memória + etapas de atualização do store e do painel."""
+
+    def __init__(self, **kwargs_download):
+        self.kwargs_download = kwargs_download
+        self.historico = None
+        self.versao = 0              # incrementa quando o histórico muda
+        self._publicada = 0          # versão com derivados e painel já atualizados
+        self._assinatura = None      # assinatura do store quando o histórico foi carregado
+        self._painel_verificado = False
+        self._lock = threading.Lock()     # uma execução do pipeline por vez
+        self._recarga = threading.Lock()  # leitura do store do disco
+        self._troca = threading.Lock()    # histórico e versão mudam juntos
+
+    def historico_atual(self):
+        """Histórico canônico, carregado uma vez e mantido entre execuções."""
+        if self.historico is None:
+            with self._recarga:
+                if self.historico is None:
+                    self._assinatura = assinatura_fonte()
+                    self.historico = carregar_historico()
+        return self.historico
+
+    def instantaneo(self):
+        """
+        (histórico, versão) lidos juntos: resultados cacheados pela versão batem
+        com o histórico. Um sorteio gravado por outro processo (cron, script)
+        entra aqui mesmo, sem esperar a próxima execução: só custa um stat.
+        """
+        self.historico_atual()
+        self._recarregar_se_mudou()
+        with self._troca:
+            return self.historico, self.versao
+
+    def _recarregar_se_mudou(self):
+        """
+        Relê o store se ele mudou no disco (este processo, outro script ou um
+        git pull); a versão só sobe quando o conteúdo é outro. Retorna True
+        se o histórico mudou.
+        """
+        if assinatura_fonte() == self._assinatura:
+            return False
+        with self._recarga:
+            assinatura = assinatura_fonte()
+            if assinatura == self._assinatura:
+                return False
+            antigo = self.historico
+            self._assinatura = assinatura
+            novo = carregar_historico()
+            if (antigo is not None and np.array_equal(antigo.ids, novo.ids)
+                    and np.array_equal(antigo.mascaras, novo.mascaras)):
+                return False
+            with self._troca:
+                self.historico = novo
+                self.versao += 1
+        return True
+
+    def executar(self, forcar=False):
+        """
+        Roda o pipeline: sonda -> (store + derivados) -> painel.
+        Retorna um relatório com o que foi feito em cada etapa.
+        """
+        with self._lock:
+            self.historico_atual()
+            self._recarregar_se_mudou()
+            # o histórico pode ter sido recarregado fora daqui (instantaneo)
+            mudou = self.versao != self._publicada
+            historico = self.historico
+            ultimo_local = int(historico.ids[-1]) if len(historico) else 0
+            relatorio = {"ultimo_local": ultimo_local, "ultimo_api": None, "novos": 0, "painel": False}
+
+            mais_recente = baixar_ultimo(**self.kwargs_download)
+            # sem a API, um sorteio que outro processo gravou ainda é publicado
+            if mais_recente is None and not forcar and not mudou:
+                relatorio["erro"] = "API indisponível"
+                return relatorio
+            ultimo_api = mais_recente[0] if mais_recente else ultimo_local
+            relatorio["ultimo_api"] = ultimo_api
+
+            if ultimo_api > ultimo_local or forcar:
+                reparo = reparar_lacunas(ultimo=max(ultimo_api, ultimo_local), **self.kwargs_download)
+                relatorio["novos"] = reparo["recuperados"]
+                relatorio["ainda_faltando"] = reparo["ainda_faltando"]
+                self._recarregar_se_mudou()
+                atualizar_derivados()
+            elif mudou:
+                # sorteio gravado por outro processo: derivados e painel acompanham
+                atualizar_derivados()
+            elif self._painel_verificado:
+                return relatorio
+
+            # Na primeira execução o painel é conferido mesmo sem sorteio novo
+            # (ex.: rankings gerados depois da última consolidação)
+            historico, versao = self.instantaneo()
+            if len(historico) >= 2:
+                relatorio["painel"] = gerar_painel(historico, forcar)
+            self._painel_verificado = True
+            self._publicada = versao
+            return relatorio
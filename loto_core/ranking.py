@@ -0,0 +1,70 @@
+import numpy as np
+from .batch import (
+    FAIXAS, PESOS_ARRAY, para_mascaras, mascaras_para_matriz,
+    calcular_scores_lote, contagens_para_dict, indices_maiores,
+)
+from .logic import mascara_para_dezenas
+from .parallel import mapear
+
+# Peso por quantidade de acertos (0..25); abaixo de 11 não pontua
+_PESO_POR_ACERTO = np.zeros(26, dtype=np.int64)
+_PESO_POR_ACERTO[list(FAIXAS)] = PESOS_ARRAY
+
+def combinacoes_mascaras(tamanho, n=25):
+    """
+    Todas as combinações de `tamanho` dezenas entre n, como máscaras uint32.
+    O array sai em ordem crescente de máscara (ordem colex), de modo que a
+    posição de cada combinação é o seu rank no sistema combinatório.
+    """
+    linhas = [np.zeros(1, dtype=np.uint32)] + [np.zeros(0, dtype=np.uint32)] * tamanho
+    for i in range(n):
+        bit = np.uint32(1 << i)
+        for k in range(min(i + 1, tamanho), max(0, tamanho - (n - i)), -1):
+            linhas[k] = np.concatenate((linhas[k], linhas[k - 1] | bit))
+    return linhas[tamanho]
+
+
+def _melhores_do_bloco(sorteios_t, args):
+    """Pontua um bloco de combinações contra a matriz (25 x sorteios) e devolve os candidatos ao top-N."""
+    ini, mascaras, top_n = args
+    acertos = (mascaras_para_matriz(mascaras, np.float32) @ sorteios_t).astype(np.uint8)
+
+    premiado = acertos >= FAIXAS[0]
+    if np.count_nonzero(premiado) < premiado.size // 4:
+        # Poucos acertos >= 11: soma esparsa só nas posições premiadas
+        pos = np.flatnonzero(premiado)
+        linhas = pos // acertos.shape[1]
+        scores = np.bincount(
+            linhas, weights=_PESO_POR_ACERTO[acertos.ravel()[pos]], minlength=len(mascaras)
+        ).astype(np.int64)
+    else:
+        scores = np.take(_PESO_POR_ACERTO, acertos).sum(axis=1)
+
+    idx = indices_maiores(scores, top_n)
+    return idx + ini, scores[idx]
+
+
+def ranking_completo(concursos, tamanho, top_n=10, processos=None, bloco=8192):
+    """
+    Pontua TODAS as combinações de `tamanho` dezenas contra o histórico e
+    devolve o top-N verdadeiro como lista de (score, counts, dezenas, atraso).
+    concursos deve estar em ordem cronológica (mais antigo primeiro).
+    Empates no score são desempatados pela ordem da combinação.
+    """
+    sorteios = para_mascaras(concursos)
+    sorteios_t = np.ascontiguousarray(mascaras_para_matriz(sorteios, np.float32).T)
+    combos = combinacoes_mascaras(tamanho)
+
+    tarefas = ((ini, combos[ini:ini + bloco], top_n) for ini in range(0, len(combos), bloco))
+    parciais = list(mapear(_melhores_do_bloco, tarefas, sorteios_t, processos, chunksize=4))
+
+    idx = np.concatenate([p[0] for p in parciais])
+    scores = np.concatenate([p[1] for p in parciais])
+    ordem = np.lexsort((idx, -scores))[:top_n]
+    finalistas = combos[idx[ordem]]
+
+    scores, contagens, atrasos = calcular_scores_lote(finalistas, sorteios)
+    return [
+        (int(s), contagens_para_dict(c), mascara_para_dezenas(int(m)), int(a))
+        for s, c, m, a in zip(scores, contagens, finalistas, atrasos)
+    ]
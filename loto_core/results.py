@@ -1,6 +1,7 @@
 import json
 import os
 from .config import RESULTS_DIR
+from .artifacts import gravar_comprimidos
 
 def garantir_pasta():
     if not os.path.exists(RESULTS_DIR):
@@ -28,6 +29,7 @@ def salvar_ranking(ranking, tamanho, total_concursos):
         })
     with open(arquivo, "w", encoding="utf-8") as f:
         json.dump(data_to_save, f, indent=4)
+    gravar_comprimidos(arquivo)
     return arquivo
 
 def carregar_ranking(tamanho, total_concursos):
@@ -0,0 +1,151 @@
+import os
+from functools import partial
+import numpy as np
+from .config import RESULTS_DIR
+from .batch import (
+    FAIXAS, PESOS_ARRAY, para_mascaras, mascaras_para_matriz, popcount32,
+    contagens_para_dict, indices_maiores,
+)
+from .logic import mascara_para_dezenas
+from .data import DrawHistory
+from .parallel import mapear
+from . import ranking
+
+ESTADO_DIR = os.path.join(RESULTS_DIR, "estado")
+
+
+class EstadoRanking:
+    """
+    Contagens de acertos 11..15 e índice do último acerto >= 11 de TODAS as
+    combinações de um tamanho. A linha i corresponde a combinacoes_mascaras(tamanho)[i].
+    """
+    __slots__ = ("tamanho", "combos", "contagens", "ultimo", "total", "concurso")
+
+    def __init__(self, tamanho, contagens, ultimo, total, concurso):
+        self.tamanho = tamanho
+        self.combos = ranking.combinacoes_mascaras(tamanho)
+        self.contagens = contagens  # uint16 (C x 5)
+        self.ultimo = ultimo        # int32 (C,), -1 se nunca acertou
+        self.total = total          # sorteios já aplicados
+        self.concurso = concurso    # id do último concurso aplicado
+
+    def aplicar(self, mascara, concurso):
+        """Aplica um novo sorteio a todas as combinações numa passada vetorizada."""
+        acertos = popcount32(self.combos & np.uint32(mascara))
+        for col, faixa in enumerate(FAIXAS):
+            self.contagens[:, col] += acertos == faixa
+        self.ultimo[acertos >= FAIXAS[0]] = self.total
+        self.total += 1
+        self.concurso = concurso
+
+    def scores(self):
+        return self.contagens @ PESOS_ARRAY
+
+    def atrasos(self, idx=slice(None)):
+        ultimo = self.ultimo[idx]
+        return np.where(ultimo >= 0, self.total - 1 - ultimo, self.total)
+
+    def top(self, n=10):
+        """Top-N exato como lista de (score, counts, dezenas, atraso)."""
+        scores = self.scores()
+        idx = indices_maiores(scores, n)
+        return [
+            (int(scores[i]), contagens_para_dict(self.contagens[i]),
+             mascara_para_dezenas(int(self.combos[i])), int(a))
+            for i, a in zip(idx, self.atrasos(idx))
+        ]
+
+
+def _contagens_do_bloco(sorteios_t, args):
+    ini, mascaras = args
+    acertos = (mascaras_para_matriz(mascaras, np.float32) @ sorteios_t).astype(np.uint8)
+    contagens = np.stack([np.count_nonzero(acertos == f, axis=1) for f in FAIXAS], axis=1)
+
+    premiado = acertos[:, ::-1] >= FAIXAS[0]
+    primeiro = premiado.argmax(axis=1)
+    achou = premiado[np.arange(len(primeiro)), primeiro]
+    ultimo = np.where(achou, acertos.shape[1] - 1 - primeiro, -1)
+    return ini, contagens.astype(np.uint16), ultimo.astype(np.int32)
+
+
+def construir_estado(mascaras, tamanho, concurso, processos=None, bloco=8192):
+    """Estado do zero a partir do histórico completo (ordem cronológica)."""
+    mascaras = para_mascaras(mascaras)
+    sorteios_t = np.ascontiguousarray(mascaras_para_matriz(mascaras, np.float32).T)
+    combos = ranking.combinacoes_mascaras(tamanho)
+    contagens = np.zeros((len(combos), len(FAIXAS)), dtype=np.uint16)
+    ultimo = np.full(len(combos), -1, dtype=np.int32)
+
+    tarefas = ((ini, combos[ini:ini + bloco]) for ini in range(0, len(combos), bloco))
+    parciais = mapear(_contagens_do_bloco, tarefas, sorteios_t, processos, chunksize=4)
+    for ini, c, u in parciais:
+        contagens[ini:ini + len(c)] = c
+        ultimo[ini:ini + len(u)] = u
+
+    return EstadoRanking(tamanho, contagens, ultimo, len(mascaras), concurso)
+
+
+def caminho_estado(tamanho):
+    return os.path.join(ESTADO_DIR, f"estado_{tamanho}dezenas.npz")
+
+
+def salvar_estado(estado):
+    os.makedirs(ESTADO_DIR, exist_ok=True)
+    caminho = caminho_estado(estado.tamanho)
+    tmp = caminho + ".tmp.npz"
+    np.savez(tmp, contagens=estado.contagens, ultimo=estado.ultimo,
+             meta=np.array([estado.total, estado.concurso], dtype=np.int64))
+    os.replace(tmp, caminho)
+    return caminho
+
+
+def carregar_estado(tamanho):
+    caminho = caminho_estado(tamanho)
+    if not os.path.exists(caminho):
+        return None
+    with np.load(caminho) as f:
+        total, concurso = (int(v) for v in f["meta"])
+        return EstadoRanking(tamanho, f["contagens"], f["ultimo"], total, concurso)
+
+
+def sincronizar_incremental(historico, carregar, construir, aplicar, salvar):
+    """
+    Carrega o estado salvo e aplica só os sorteios novos; reconstrói do zero
+    se não houver estado ou se o histórico não bater com ele. Serve para
+    qualquer estado com `total` (sorteios aplicados) e `concurso` (id do último).
+    carregar() -> estado ou None; construir(historico) -> estado em dia;
+    aplicar(estado, novos) recebe o DrawHistory dos sorteios novos; salvar(estado).
+    Retorna (estado, novos_aplicados); novos_aplicados = None quando reconstruído.
+    """
+    historico = DrawHistory.de_concursos(historico)
+    ids = historico.ids
+    estado = carregar()
+    if estado is None or estado.total > len(ids) or (estado.total and ids[estado.total - 1] != estado.concurso):
+        estado = construir(historico)
+        salvar(estado)
+        return estado, None
+
+    novos = len(ids) - estado.total
+    if novos:
+        aplicar(estado, historico[estado.total:])
+        salvar(estado)
+    return estado, novos
+
+
+def _aplicar_novos(estado, novos):
+    for concurso, mascara in zip(novos.ids.tolist(), novos.mascaras.tolist()):
+        estado.aplicar(mascara, concurso)
+
+
+def sincronizar_estado(historico, tamanho, processos=None):
+    """
+    Estado do ranking de `tamanho` dezenas em dia com o histórico
+    (DrawHistory ou lista de (id, data, dezenas)); ver sincronizar_incremental.
+    """
+    return sincronizar_incremental(
+        historico,
+        partial(carregar_estado, tamanho),
+        lambda h: construir_estado(h.mascaras, tamanho, int(h.ids[-1]), processos),
+        _aplicar_novos,
+        salvar_estado,
+    )
@@ -0,0 +1,226 @@
+import csv
+import hashlib
+import json
+import os
+import numpy as np
+from .config import DATA_DIR, CACHE_FILE, CSV_FILE, HISTORY_FILE, JOURNAL_FILE
+from .data import (
+    DrawHistory, carregar_dados, anexar_journal, carregar_journal, compactar_historico, JOURNAL_LIMITE,
+)
+from .ingest import baixar_concursos
+from .artifacts import gravar_comprimidos
+
+# --- STORE CANÔNICO ---
+# O binário HISTORY_FILE (snapshot) + JOURNAL_FILE é a única fonte de verdade.
+# Os JSONs e o CSV são views derivadas, regeneradas só quando a fonte mudou
+# desde a última geração e sempre gravadas num temporário + os.replace, para
+# que quem lê (ex.: o serve_app) nunca veja um arquivo pela metade.
+
+RESULTADOS_FILE = os.path.join(DATA_DIR, "resultados_lotofacil.json")
+MANIFESTO_FILE = os.path.join(DATA_DIR, "derivados.json")
+
+
+def _gerar_cache_json(historico, f):
+    dados = [{"concurso": c, "data": d, "dezenas": sorted(dz)} for c, d, dz in historico]
+    json.dump(dados, f, ensure_ascii=False, indent=2)
+
+
+def _gerar_resultados_json(historico, f):
+    dados = [[c, sorted(dz)] for c, _, dz in historico]
+    json.dump(dados, f, ensure_ascii=False)
+
+
+def _gerar_csv(historico, f):
+    writer = csv.writer(f)
+    writer.writerow(["Concurso", "Data"] + [f"Bola{i}" for i in range(1, 16)])
+    for c, d, dz in historico:
+        writer.writerow([c, d] + sorted(dz))
+
+
+def _gravar_atomico(caminho, gerar, historico):
+    """Gera a view num temporário ao lado do destino e troca de uma vez."""
+    tmp = caminho + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        gerar(historico, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, caminho)
+    gravar_comprimidos(caminho)
+
+
+# nome -> (caminho, gerador)
+DERIVADOS = {
+    "cache_json": (CACHE_FILE, _gerar_cache_json),
+    "resultados_json": (RESULTADOS_FILE, _gerar_resultados_json),
+    "csv": (CSV_FILE, _gerar_csv),
+}
+DERIVADOS_PADRAO = ("cache_json", "resultados_json")
+
+
+def carregar_historico():
+    """Histórico canônico (DrawHistory). Na primeira vez, cria o binário a partir dos arquivos legados."""
+    return carregar_dados()
+
+
+def adicionar_concursos(concursos, historico=None):
+    """
+    Registra concursos novos no store. concursos: iterável de (id, data_str, dezenas).
+    Ids posteriores ao último viram um registro no journal cada; ids antigos
+    (preenchimento de lacunas) forçam a compactação num snapshot ordenado.
+    Retorna a quantidade de concursos efetivamente adicionados.
+    """
+    historico = carregar_historico() if historico is None else historico
+    existentes = set(historico.ids.tolist())
+    novos = sorted({c[0]: c for c in concursos if c[0] not in existentes}.values())
+    if not novos:
+        return 0
+
+    ultimo = int(historico.ids[-1]) if len(historico) else 0
+    if novos[0][0] > ultimo and os.path.exists(HISTORY_FILE):
+        for concurso, data_str, dezenas in novos:
+            anexar_journal(concurso, data_str, dezenas)
+    else:
+        extra = DrawHistory.de_concursos(novos)
+        compactar_historico(DrawHistory(
+            np.concatenate((historico.ids, extra.ids)),
+            np.concatenate((historico.ordinais, extra.ordinais)),
+            np.concatenate((historico.mascaras, extra.mascaras)),
+        ))
+    return len(novos)
+
+
+def compactar_journal(limite=JOURNAL_LIMITE):
+    """
+    Incorpora o journal ao snapshot se ele tiver ao menos `limite` registros.
+    Quem publica o histórico (ex.: commit no git) leva snapshot e journal
+    juntos, então não precisa compactar antes. Retorna se compactou.
+    """
+    if len(carregar_journal(JOURNAL_FILE)) < max(limite, 1):
+        return False
+    compactar_historico()
+    return True
+
+
+# --- LACUNAS E DUPLICATAS ---
+
+def verificar_sequencia(historico, primeiro=1, ultimo=None):
+    """
+    Confere a sequência de ids numa passada vetorizada.
+    Retorna (faltando, duplicados) como listas de ids; `ultimo` (ex.: o mais
+    recente da API) permite enxergar também as lacunas no fim do histórico.
+    """
+    ids = historico.ids
+    if ultimo is None:
+        ultimo = int(ids[-1]) if len(ids) else primeiro - 1
+    repetido = ids[1:] == ids[:-1]
+    duplicados = np.unique(ids[1:][repetido])
+    faltando = np.setdiff1d(np.arange(primeiro, ultimo + 1, dtype=ids.dtype), ids, assume_unique=False)
+    return faltando.tolist(), duplicados.tolist()
+
+
+def remover_duplicados(historico):
+    """View sem ids repetidos (fica o último registro gravado de cada id)."""
+    ids = historico.ids
+    manter = np.ones(len(ids), dtype=bool)
+    manter[:-1] = ids[1:] != ids[:-1]
+    return DrawHistory(ids[manter], historico.ordinais[manter], historico.mascaras[manter], ordenado=True)
+
+
+def reparar_lacunas(ultimo=None, **kwargs_download):
+    """
+    Remove duplicatas do store e baixa (concorrentemente) só os concursos que
+    faltam até `ultimo`. Retorna um relatório com o que foi encontrado e recuperado.
+    """
+    historico = carregar_historico()
+    faltando, duplicados = verificar_sequencia(historico, ultimo=ultimo)
+    if duplicados:
+        historico = remover_duplicados(historico)
+        compactar_historico(historico)
+
+    baixados = [d for d in baixar_concursos(faltando, **kwargs_download) if d is not None] if faltando else []
+    recuperados = adicionar_concursos(baixados, historico)
+    recuperados_ids = {d[0] for d in baixados}
+    return {
+        "faltando": faltando,
+        "duplicados": duplicados,
+        "recuperados": recuperados,
+        "ainda_faltando": [c for c in faltando if c not in recuperados_ids],
+    }
+
+
+def assinatura_fonte():
+    """Tamanho e mtime do snapshot e do journal (0 para o journal ausente)."""
+    assinatura = {}
+    for prefixo, caminho in (("", HISTORY_FILE), ("journal_", JOURNAL_FILE)):
+        st = os.stat(caminho) if os.path.exists(caminho) else None
+        assinatura[prefixo + "tamanho"] = st.st_size if st else 0
+        assinatura[prefixo + "mtime_ns"] = st.st_mtime_ns if st else 0
+    return assinatura
+
+
+def _sha1():
+    """Hash do conteúdo da fonte: snapshot seguido do journal."""
+    h = hashlib.sha1()
+    for caminho in (HISTORY_FILE, JOURNAL_FILE):
+        if not os.path.exists(caminho):
+            continue
+        with open(caminho, "rb") as f:
+            for bloco in iter(lambda: f.read(1 << 16), b""):
+                h.update(bloco)
+    return h.hexdigest()
+
+
+def _carregar_manifesto():
+    if not os.path.exists(MANIFESTO_FILE):
+        return {}
+    try:
+        with open(MANIFESTO_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def derivados_desatualizados(nomes=DERIVADOS_PADRAO):
+    """Nomes das views cuja fonte mudou (tamanho/mtime e depois hash) ou que não existem."""
+    manifesto = _carregar_manifesto()
+    assinatura = assinatura_fonte()
+    sha1 = None
+    stale = []
+    for nome in nomes:
+        caminho, _ = DERIVADOS[nome]
+        registro = manifesto.get(nome)
+        if not os.path.exists(caminho) or not registro:
+            stale.append(nome)
+            continue
+        if all(registro.get(k) == v for k, v in assinatura.items()):
+            continue
+        sha1 = sha1 or _sha1()
+        if registro.get("sha1") != sha1:
+            stale.append(nome)
+    return stale
+
+
+def atualizar_derivados(nomes=DERIVADOS_PADRAO, forcar=False):
+    """Regenera as views derivadas que estiverem desatualizadas. Retorna os nomes regenerados."""
+    stale = list(nomes) if forcar else derivados_desatualizados(nomes)
+    manifesto = _carregar_manifesto()
+    assinatura = assinatura_fonte()
+    if not stale and all(
+        all(manifesto[nome].get(k) == v for k, v in assinatura.items()) for nome in nomes
+    ):
+        return []
+
+    if stale:
+        historico = carregar_historico()
+        for nome in stale:
+            caminho, gerar = DERIVADOS[nome]
+            _gravar_atomico(caminho, gerar, historico)
+    registro = dict(assinatura, sha1=_sha1())
+    for nome in nomes:
+        manifesto[nome] = registro
+
+    tmp = MANIFESTO_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, indent=2)
+    os.replace(tmp, MANIFESTO_FILE)
+    return stale
@@ -0,0 +1,128 @@
+"""
+Avaliação exata de famílias estruturadas de apostas.
+
+Uma família é descrita por uma partição das 25 dezenas em grupos e por
+vetores de escolha: cada aposta pega exatamente c_g dezenas do grupo g, em
+todas as combinações possíveis. Se o sorteio tem k_g dezenas no grupo g
+(de n_g), o número de apostas que acertam i dezenas nesse grupo é
+C(k_g, i) * C(n_g - k_g, c_g - i). Os grupos são independentes, então a
+distribuição de acertos da família inteira é o produto (convolução) desses
+polinômios — sem materializar nenhuma aposta.
+
+Exemplo: "5 a 7 de fora" usa os grupos {fora do último sorteio} (10) e
+{dentro} (15) com escolhas (5, 10), (6, 9) e (7, 8).
+"""
+from math import comb
+import numpy as np
+from .batch import popcount32, espalhar_mascaras
+from .data import DrawHistory
+from .logic import dezenas_para_mascara
+from .ranking import combinacoes_mascaras
+
+TODAS = (1 << 25) - 1
+
+
+def polinomio_grupo(n, k, c):
+    """Coeficientes (índice = acertos no grupo) de um grupo de n dezenas, k sorteadas, c escolhidas."""
+    return np.array([comb(k, i) * comb(n - k, c - i) for i in range(c + 1)], dtype=np.int64)
+
+
+def distribuicao_acertos(tamanhos, sorteados, escolhas_lista):
+    """
+    Quantidade de apostas da família com 0..15 acertos (array de 16).
+    tamanhos[g]: dezenas no grupo g; sorteados[g]: quantas saíram nele;
+    escolhas_lista: vetores (c_g) que compõem a família.
+    """
+    total = np.zeros(16, dtype=np.int64)
+    for escolhas in escolhas_lista:
+        dist = np.ones(1, dtype=np.int64)
+        for n, k, c in zip(tamanhos, sorteados, escolhas):
+            dist = np.convolve(dist, polinomio_grupo(n, k, c))
+        total[:len(dist)] += dist
+    return total
+
+
+def apostas_por_familia(tamanhos, escolhas_lista):
+    """Quantidade de apostas de uma família."""
+    return sum(int(np.prod([comb(n, c) for n, c in zip(tamanhos, e)])) for e in escolhas_lista)
+
+
+def avaliar_familia(grupos, escolhas_lista, sorteio):
+    """Distribuição de acertos (16) da família definida por `grupos` (máscaras) contra um sorteio."""
+    sorteio = sorteio if isinstance(sorteio, int) else dezenas_para_mascara(sorteio)
+    tamanhos = [g.bit_count() for g in grupos]
+    sorteados = [(g & sorteio).bit_count() for g in grupos]
+    return distribuicao_acertos(tamanhos, sorteados, escolhas_lista)
+
+
+def gerar_apostas_familia(grupos, escolhas_lista):
+    """Todas as apostas da família como máscaras uint32 (para conferência por força bruta)."""
+    posicoes = [[b for b in range(25) if g >> b & 1] for g in grupos]
+    partes = []
+    for escolhas in escolhas_lista:
+        apostas = np.zeros(1, dtype=np.uint32)
+        for pos, c in zip(posicoes, escolhas):
+            locais = combinacoes_mascaras(c, len(pos))
+            apostas = np.bitwise_or.outer(apostas, espalhar_mascaras(locais, pos)).ravel()
+        partes.append(apostas)
+    return np.concatenate(partes)
+
+
+# --- "5 A 7 DE FORA" ---
+
+ESCOLHAS_FORA = {q: (q, 15 - q) for q in (5, 6, 7)}
+
+
+def escolhas_fora(qtds=(5, 6, 7)):
+    return [ESCOLHAS_FORA[q] for q in qtds]
+
+
+def tabela_fora(qtds=(5, 6, 7)):
+    """Distribuição de acertos (11 x 16) indexada por quantas dezenas de fora saíram (0..10)."""
+    escolhas = escolhas_fora(qtds)
+    return np.array([distribuicao_acertos((10, 15), (x, 15 - x), escolhas) for x in range(11)])
+
+
+class FamiliaFora:
+    """
+    Estratégia de backtest: apostar a família "qtds de fora" montada a partir
+    do último sorteio do prefixo. Avaliada em forma fechada (distribuicao);
+    chamar a instância materializa as apostas.
+    """
+    __slots__ = ("qtds", "tabela", "n_apostas")
+
+    def __init__(self, qtds=(5, 6, 7)):
+        self.qtds = tuple(qtds)
+        self.tabela = tabela_fora(self.qtds)
+        self.n_apostas = apostas_por_familia((10, 15), escolhas_fora(self.qtds))
+
+    def __call__(self, prefixo):
+        atual = int(prefixo.mascaras[-1])
+        return gerar_apostas_familia((TODAS & ~atual, atual), escolhas_fora(self.qtds))
+
+    def quantidade(self, prefixo):
+        return self.n_apostas
+
+    def distribuicao(self, prefixo, sorteio):
+        # só importa quantas dezenas de fora do último sorteio saíram agora
+        return self.tabela[(sorteio & ~int(prefixo.mascaras[-1]) & TODAS).bit_count()]
+
+
+def conferir_fora(historico, amostra=20, qtds=(5, 6, 7), semente=0):
+    """
+    Confere a fórmula contra força bruta (apostas materializadas + popcount)
+    em `amostra` concursos sorteados. Retorna o número de concursos conferidos;
+    levanta AssertionError na primeira divergência.
+    """
+    historico = DrawHistory.de_concursos(historico)
+    rng = np.random.default_rng(semente)
+    escolhas = escolhas_fora(qtds)
+    indices = rng.choice(len(historico) - 1, size=min(amostra, len(historico) - 1), replace=False)
+    for i in indices:
+        atual, prox = int(historico.mascaras[i]), int(historico.mascaras[i + 1])
+        grupos = (TODAS & ~atual, atual)
+        apostas = gerar_apostas_familia(grupos, escolhas)
+        bruto = np.bincount(popcount32(apostas & np.uint32(prox)), minlength=16)
+        exato = avaliar_familia(grupos, escolhas, prox)
+        assert np.array_equal(bruto, exato), f"divergência no concurso {historico.ids[i + 1]}"
+    return len(indices)
@@ -1,10 +1,15 @@
-import json
 import os
-from itertools import combinations
+import sys
+import numpy as np
 
 # Configurações de caminhos
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_FILE = os.path.join(BASE_DIR, "data", "resultados_lotofacil.json")
+sys.path.insert(0, BASE_DIR)
+
+from loto_core.data import carregar_dados
+from loto_core.backtest import backtest, JogosFixos
+from loto_core.montecarlo import simular
+from loto_core.coverage import verificar_cobertura
 
 # Dados do Usuário
 USER_17_NUMS = [1, 2, 3, 5, 6, 7, 9, 11, 12, 14, 16, 17, 18, 20, 22, 24, 25]
@@ -26,54 +31,19 @@ user_17_set = set(USER_17_NUMS)
 def validate_coverage(pool, games_sets):
     """Valida se garante 14 pontos se 15 estiverem no pool."""
     print(f"Validando cobertura C({len(pool)}, 15)...")
-    total_combos = 0
-    covered_14 = 0
-    covered_15 = 0
-    
-    for combo in combinations(pool, 15):
-        total_combos += 1
-        combo_set = set(combo)
-        max_hits = 0
-        for g in games_sets:
-            hits = len(g & combo_set)
-            if hits > max_hits:
-                max_hits = hits
-        
-        if max_hits >= 15:
-            covered_15 += 1
-            covered_14 += 1
-        elif max_hits >= 14:
-            covered_14 += 1
-            
-    return total_combos, covered_15, covered_14
+    relatorio = verificar_cobertura(games_sets, pool, alvo=14)
+    return relatorio.total, relatorio.cobertos(15), relatorio.cobertos(14)
+
+def run_history_analysis(games_sets, historico):
+    if not len(historico):
+        print("Histórico de concursos vazio.")
+        return None, 0
 
-def run_history_analysis(games_sets, results_file):
-    if not os.path.exists(results_file):
-        print(f"Arquivo de resultados não encontrado: {results_file}")
-        return None
-        
-    with open(results_file, "r") as f:
-        resultados = json.load(f)
-        
-    stats = {15: 0, 14: 0, 13: 0, 12: 0, 11: 0}
-    total_concursos = len(resultados)
-    
-    for concurso in resultados:
-        # concurso[1] é a lista de números
-        sorteio_set = set(concurso[1])
-        concurso_max_hits = 0
-        
-        # Para cada concurso, vemos qual foi o melhor desempenho dos 8 jogos
-        best_in_concurso = 0
-        for g in games_sets:
-            hits = len(g & sorteio_set)
-            if hits > best_in_concurso:
-                best_in_concurso = hits
-        
-        if best_in_concurso >= 11:
-            stats[best_in_concurso] += 1
-            
-    return stats, total_concursos
+    # Para cada concurso, vemos qual foi o melhor desempenho dos 8 jogos
+    resultado = backtest(historico, JogosFixos(games_sets), inicio=0)
+    melhores = np.bincount(resultado.melhor, minlength=16)
+    stats = {pontos: int(melhores[pontos]) for pontos in (15, 14, 13, 12, 11)}
+    return stats, len(resultado)
 
 print("--- ANÁLISE DO FECHAMENTO DO USUÁRIO ---")
 total_c, c15, c14 = validate_coverage(USER_17_NUMS, user_games_sets)
@@ -82,8 +52,15 @@ print(f"Garante 15 pontos: {c15} ({c15/total_c*100:.1f}%)")
 print(f"Garante 14 pontos: {c14} ({c14/total_c*100:.1f}%)")
 
 print("\n--- DESEMPENHO HISTÓRICO (8 JOGOS) ---")
-hist_stats, total_conc = run_history_analysis(user_games_sets, DATA_FILE)
+hist_stats, total_conc = run_history_analysis(user_games_sets, carregar_dados())
 if hist_stats:
     print(f"Total de concursos analisados: {total_conc}")
     for pontos in [15, 14, 13, 12, 11]:
         print(f"{pontos} pontos: {hist_stats[pontos]} vezes")
+
+    # Modelo nulo: os mesmos 8 jogos contra sorteios aleatórios (semente fixa)
+    print("\n--- MODELO NULO (2.000.000 SORTEIOS ALEATÓRIOS) ---")
+    nulo = simular(user_games_sets, 2_000_000, semente=0).frequencias()
+    for pontos in [15, 14, 13, 12, 11]:
+        p, inf, sup = nulo[pontos]["melhor"]
+        print(f"{pontos} pontos: esperado {p * total_conc:.1f} vezes (IC 95%: {inf * total_conc:.1f} a {sup * total_conc:.1f})")
@@ -1,16 +1,15 @@
-import json
 from itertools import combinations
 
 import os
+import sys
 
 # Caminho para os dados
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_FILE = os.path.join(BASE_DIR, "data", "resultados_lotofacil.json")
+sys.path.insert(0, BASE_DIR)
 
-with open(DATA_FILE, "r") as f:
-    resultados = json.load(f)
+from loto_core.data import carregar_dados
 
-sorteios = [(c, set(n)) for c, n in resultados]
+sorteios = [(c, set(n)) for c, _, n in carregar_dados()]
 total = len(sorteios)
 
 print("Analisando atraso de conjuntos de 17 dezenas...")
@@ -1,68 +1,50 @@
-import urllib.request
-import json
 import os
-import time
+import sys
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATA_FILE = os.path.join(BASE_DIR, "data", "resultados_lotofacil.json")
+sys.path.insert(0, BASE_DIR)
 
-def carregar_resultados():
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-def salvar_resultados(dados):
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(dados, f, ensure_ascii=False)
-
-def baixar_concurso(numero):
-    url = f"https://servicebus2.caixa.gov.br/portaldeloterias/api/lotofacil/{numero}"
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=10) as r:
-            data = json.loads(r.read())
-            numeros = sorted([int(n) for n in data["dezenasSorteadasOrdemSorteio"]])
-            return numeros
-    except Exception:
-        return None
+from loto_core.ingest import baixar_ultimo
+from loto_core.store import carregar_historico, reparar_lacunas, atualizar_derivados
 
 def main():
     print("\n" + "="*50)
     print("  🔄 ATUALIZADOR DE CONCURSOS — LOTOFÁCIL")
     print("="*50)
 
-    # Carregar dados existentes
-    dados = carregar_resultados()
+    # Carregar histórico existente (store canônico)
+    historico = carregar_historico()
 
-    # Pegar último concurso no arquivo
-    ultimo = max(item[0] for item in dados if isinstance(item, list))
+    # Pegar último concurso no histórico
+    ultimo = int(historico.ids[-1])
     print(f"\n  Último concurso no arquivo: {ultimo}")
 
-    # Buscar novos concursos
-    print(f"  Buscando concursos a partir do {ultimo + 1}...\n")
+    # Buscar novos concursos e lacunas
+    print(f"  Buscando concursos ausentes até o mais recente...\n")
 
-    adicionados = 0
-    concurso = ultimo + 1
+    mais_recente = baixar_ultimo()
+    if mais_recente is None:
+        print("  ❌ Não foi possível consultar o concurso mais recente na API.")
+        return
+    print(f"  Concurso mais recente na API: {mais_recente[0]}\n")
 
-    while True:
-        numeros = baixar_concurso(concurso)
-        if numeros is None:
-            print(f"  ℹ️  Concurso {concurso} não encontrado — arquivo atualizado!")
-            break
-
-        dados.append([concurso, numeros])
-        print(f"  ✅ Concurso {concurso}: {numeros}")
-        adicionados += 1
-        concurso += 1
-        time.sleep(0.3)
+    # Lacunas no meio do histórico + concursos novos: baixa só os ids ausentes
+    relatorio = reparar_lacunas(ultimo=mais_recente[0])
+    if relatorio["duplicados"]:
+        print(f"  🧹 Concursos duplicados removidos: {relatorio['duplicados']}")
+    for concurso in relatorio["ainda_faltando"]:
+        print(f"  ⚠️  Concurso {concurso} não encontrado.")
 
+    adicionados = relatorio["recuperados"]
     if adicionados > 0:
-        dados.sort(key=lambda x: x[0] if isinstance(x, list) else 0)
-        salvar_resultados(dados)
         print(f"\n  💾 {adicionados} concurso(s) adicionado(s) com sucesso!")
-        print(f"  Total de sorteios no arquivo: {len(dados)}")
+        print(f"  Total de sorteios no arquivo: {len(carregar_historico())}")
     else:
         print("\n  ✅ Arquivo já está atualizado!")
 
+    # JSONs derivados só são regravados se o histórico mudou
+    atualizar_derivados()
+
     print()
 
 if __name__ == "__main__":
@@ -8,8 +8,10 @@ Como usar:
 
 O que ele faz:
     1. Baixa os concursos mais recentes da API da Caixa
-    2. Salva/atualiza o cache local (lotofacil_cache.json)
-    3. Recalcula os rankings para 17, 18, 19 e 20 dezenas
+    2. Registra os novos no histórico canônico (lotofacil_cache.bin) e regenera
+       os JSONs derivados (lotofacil_cache.json, resultados_lotofacil.json)
+    3. Recalcula os rankings para 15, 17, 18, 19 e 20 dezenas pontuando
+       todas as combinações de cada tamanho (estado incremental em resultados/estado/)
     4. Salva os JSONs em resultados/ e src/data/resultados/
     5. Faz git add + commit + push automático para o GitHub
 """
@@ -20,12 +22,18 @@ import json
 import shutil
 import subprocess
 import itertools
-import requests
 from datetime import datetime
 
 # ─── Configuração ────────────────────────────────────────────────────────────
 SCRIPT_DIR    = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR      = os.path.dirname(SCRIPT_DIR) # Root of the project
+sys.path.insert(0, BASE_DIR)
+
+from loto_core.ingest import baixar_concursos
+from loto_core.store import carregar_historico, reparar_lacunas, atualizar_derivados, compactar_journal
+from loto_core.artifacts import gravar_comprimidos
+from loto_core.state import sincronizar_estado
+
 CACHE_FILE    = os.path.join(BASE_DIR, "data", "lotofacil_cache.json")
 RESULTS_DIR   = os.path.join(BASE_DIR, "resultados")
 FRONTEND_DIR  = os.path.join(BASE_DIR, "src", "data", "resultados")
@@ -36,10 +44,6 @@ DESKTOP_DIR   = os.path.join(os.path.expanduser("~"), "Desktop", "17 top1")
 DEZENAS_CONFIG = [15, 17, 18, 19, 20]
 TOP_N          = 10  # quantos jogos salvar por ranking
 
-PESOS = {15: 1000, 14: 200, 13: 30, 12: 5, 11: 1}
-
-API_CAIXA = "https://servicebus2.caixa.gov.br/portaldeloterias/api/lotofacil/{}"
-
 # ─── Cores no terminal ───────────────────────────────────────────────────────
 VERDE   = "\033[92m"
 AMARELO = "\033[93m"
@@ -54,157 +58,82 @@ def log(msg, cor=RESET):
 # ─── 1. Download de dados da Caixa ───────────────────────────────────────────
 def baixar_concurso(numero):
     """Retorna dict com concurso, data, dezenas ou None em caso de erro."""
-    try:
-        url = API_CAIXA.format(numero if numero else "")
-        r = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-        if r.status_code == 200:
-            d = r.json()
-            if not d or not d.get("numero"):
-                return None
-            dezenas = []
-            for i in range(1, 16):
-                key = f"dezena{i}"
-                if d.get(key):
-                    dezenas.append(int(d[key]))
-                elif d.get("listaDezenas") and len(d["listaDezenas"]) >= i:
-                    dezenas.append(int(d["listaDezenas"][i - 1]))
-            if len(dezenas) == 15:
-                return {
-                    "concurso": d["numero"],
-                    "data": d.get("dataApuracao", ""),
-                    "dezenas": sorted(dezenas)
-                }
-    except Exception as e:
-        pass
-    return None
+    dados = baixar_concursos([numero])[0]
+    if dados is None:
+        return None
+    concurso, data, dezenas = dados
+    return {"concurso": concurso, "data": data, "dezenas": dezenas}
 
 def atualizar_cache():
-    """Baixa concursos novos e atualiza o cache local."""
+    """Baixa concursos novos, registra no store canônico e regenera as views derivadas."""
     log("\n📡 Verificando dados mais recentes...", CIANO)
 
-    # Carregar cache existente
-    cache = []
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            cache = json.load(f)
-        log(f"   Cache existente: {len(cache)} concursos (último: {cache[-1]['concurso'] if cache else 0})", AMARELO)
-
-    ultimo_local = cache[-1]["concurso"] if cache else 0
+    # Carregar histórico existente (binário canônico)
+    historico = carregar_historico()
+    ultimo_local = int(historico.ids[-1]) if len(historico) else 0
+    if len(historico):
+        log(f"   Cache existente: {len(historico)} concursos (último: {ultimo_local})", AMARELO)
 
     # Descobrir último concurso na API
     ultimo_api_data = baixar_concurso(None)
     if not ultimo_api_data:
         log("   ❌ Não foi possível conectar à API da Caixa.", VERMELHO)
-        return cache, ultimo_local
+        return historico, ultimo_local
 
     ultimo_api = ultimo_api_data["concurso"]
     log(f"   Último concurso na API: {ultimo_api}", VERDE)
 
-    if ultimo_api <= ultimo_local:
+    # Lacunas internas + concursos novos: só os ids ausentes são baixados (em paralelo)
+    relatorio = reparar_lacunas(ultimo=max(ultimo_api, ultimo_local))
+    if relatorio["duplicados"]:
+        log(f"   🧹 Duplicados removidos: {relatorio['duplicados']}", AMARELO)
+    if not relatorio["faltando"]:
         log(f"   ✅ Cache já está atualizado até o concurso {ultimo_local}.", VERDE)
-        return cache, ultimo_local
-
-    # Baixar concursos novos
-    novos = []
-    for num in range(ultimo_local + 1, ultimo_api + 1):
-        log(f"   ⬇️  Baixando concurso {num}...", AMARELO)
-        dados = baixar_concurso(num)
-        if dados:
-            novos.append(dados)
-            log(f"      ✅ {num} → {dados['dezenas']}", VERDE)
-        else:
+    else:
+        log(f"   ⬇️  {len(relatorio['faltando'])} concurso(s) ausente(s), {relatorio['recuperados']} baixado(s).", AMARELO)
+        for num in relatorio["ainda_faltando"]:
             log(f"      ⚠️  Concurso {num} não encontrado.", AMARELO)
 
-    if novos:
-        cache.extend(novos)
-        cache.sort(key=lambda x: x["concurso"])
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(cache, f, ensure_ascii=False, indent=2)
-        log(f"\n   💾 Cache atualizado: {len(cache)} concursos (até {cache[-1]['concurso']})", VERDE)
+    if relatorio["recuperados"] or relatorio["duplicados"]:
+        historico = carregar_historico()
+        log(f"\n   💾 Cache atualizado: {len(historico)} concursos (até {historico.ids[-1]})", VERDE)
 
-    return cache, cache[-1]["concurso"] if cache else ultimo_local
+    # Snapshot e journal vão juntos para o git; o snapshot só é regravado
+    # quando o journal chega a JOURNAL_LIMITE registros
+    compactar_journal()
+    # JSONs derivados (lotofacil_cache.json, resultados_lotofacil.json) só se a fonte mudou
+    atualizar_derivados()
+    return historico, int(historico.ids[-1]) if len(historico) else ultimo_local
 
 # ─── 2. Geração de rankings ───────────────────────────────────────────────────
-def calcular_score_e_atraso(jogo_set, concursos_sorted):
-    """Calcula score ponderado e atraso de um jogo."""
-    ct = {11: 0, 12: 0, 13: 0, 14: 0, 15: 0}
-    atraso = 0
-    achou_ultimo = False
-
-    for i, (_, _, dezenas) in enumerate(concursos_sorted):
-        acertos = len(jogo_set & dezenas)
-        if acertos >= 11:
-            ct[acertos] += 1
-            if not achou_ultimo:
-                atraso = i  # quantos sorteios desde o último 11+
-                achou_ultimo = True
-
-    if not achou_ultimo:
-        atraso = len(concursos_sorted)
-
-    score = sum(ct[f] * PESOS[f] for f in PESOS)
-    return score, ct, atraso
-
 def gerar_ranking(concursos, tamanho):
     """Gera o top-N ranking para jogos de `tamanho` dezenas."""
     log(f"\n🔢 Calculando ranking para {tamanho} dezenas...", CIANO)
 
-    # Concursos ordenados do mais recente para o mais antigo
-    concursos_sorted = sorted(concursos, key=lambda x: x[0], reverse=True)
-    concursos_frozenset = [(c, d, frozenset(dz)) for c, d, dz in concursos_sorted]
-
     total = len(concursos)
     log(f"   Total de concursos: {total}", AMARELO)
 
-    # Carregar ranking anterior para comparar
-    nome_arquivo = lambda n: os.path.join(RESULTS_DIR, f"top10_{tamanho}dezenas_{n}concursos.json")
-    ranking_anterior = None
-    if os.path.exists(nome_arquivo(total)):
+    nome_arquivo = os.path.join(RESULTS_DIR, f"top10_{tamanho}dezenas_{total}concursos.json")
+    if os.path.exists(nome_arquivo):
         log(f"   ✅ Ranking já existe para {total} concursos. Pulando recálculo.", VERDE)
-        with open(nome_arquivo(total), "r", encoding="utf-8") as f:
+        with open(nome_arquivo, "r", encoding="utf-8") as f:
             return json.load(f), total
 
-    # Verificar se há ranking anterior para reusar como base
-    import re, glob
-    arquivos = glob.glob(os.path.join(RESULTS_DIR, f"top10_{tamanho}dezenas_*concursos.json"))
-    if arquivos:
-        # Pegar o mais recente
-        mais_recente = max(arquivos, key=lambda x: int(re.search(r"(\d+)concursos", x).group(1)))
-        num_ant = int(re.search(r"(\d+)concursos", mais_recente).group(1))
-        if num_ant == total:
-            log(f"   ✅ Ranking já atualizado.", VERDE)
-            with open(mais_recente, "r", encoding="utf-8") as f:
-                return json.load(f), total
-
-        log(f"   🔄 Ranking base: {num_ant} → recalculando para {total}", AMARELO)
-        with open(mais_recente, "r", encoding="utf-8") as f:
-            ranking_anterior = json.load(f)
-
-    # Sem ranking anterior → recalcular do zero (apenas com o top existente)
-    if ranking_anterior is None:
-        log(f"   ❌ Nenhum ranking anterior encontrado para {tamanho} dezenas.", VERMELHO)
-        log(f"   ⚠️  Use os scripts originais do loto_core para gerar o ranking base.", AMARELO)
-        return None, total
-
-    # Recalcular apenas os novos concursos para os jogos já rankeados
-    novos_concursos = [(c, d, dz) for c, d, dz in concursos_frozenset if c > num_ant]
-    log(f"   📊 {len(novos_concursos)} novos concursos a processar para {len(ranking_anterior)} jogos...", AMARELO)
-
-    resultados_atualizados = []
-    for item in ranking_anterior:
-        jogo_set = frozenset(item["dezenas"])
-        # Score e atraso completo com todos os concursos
-        score, ct, atraso = calcular_score_e_atraso(jogo_set, concursos_frozenset)
-        resultados_atualizados.append({
-            "score": score,
-            "counts": {str(k): v for k, v in ct.items()},
-            "dezenas": item["dezenas"],
-            "atraso": atraso
-        })
-
-    # Reordenar por score
-    resultados_atualizados.sort(key=lambda x: x["score"], reverse=True)
-    top = resultados_atualizados[:TOP_N]
+    # Estado persistido com as contagens de TODAS as combinações de `tamanho` dezenas:
+    # só os concursos novos são aplicados; sem estado, pontua o histórico completo
+    estado, novos = sincronizar_estado(concursos, tamanho)
+    if novos is None:
+        log(f"   📊 Estado reconstruído: todas as combinações de {tamanho} dezenas pontuadas.", AMARELO)
+    else:
+        log(f"   📊 {novos} novo(s) concurso(s) aplicado(s) ao estado.", AMARELO)
+    ranking = estado.top(TOP_N)
+
+    top = [{
+        "score": score,
+        "counts": {str(k): v for k, v in ct.items()},
+        "dezenas": dezenas,
+        "atraso": atraso
+    } for score, ct, dezenas, atraso in ranking]
 
     log(f"   ✅ Top {TOP_N} gerado para {tamanho} dezenas.", VERDE)
     return top, total
@@ -222,6 +151,9 @@ def salvar_e_copiar(dados, tamanho, total_concursos):
         json.dump(dados, f, ensure_ascii=False, indent=4)
 
     shutil.copy(caminho_results, caminho_frontend)
+    # Variantes .gz/.br servidas pelo serve_app conforme o Accept-Encoding
+    gravar_comprimidos(caminho_results)
+    gravar_comprimidos(caminho_frontend)
     log(f"   ✅ Salvo: {nome}", VERDE)
 
 # ─── 3b. Sincronizar Desktop ─────────────────────────────────────────────────
@@ -260,9 +192,13 @@ def git_push(total_concursos):
     try:
         # Usar -f para garantir que o cache seja adicionado mesmo se estiver no gitignore por engano
         subprocess.run(["git", "add", "-f",
-            os.path.join(BASE_DIR, "resultados/"),
-            os.path.join(BASE_DIR, "src/data/resultados/"),
-            os.path.join(BASE_DIR, "data/lotofacil_cache.json")
+            os.path.join(BASE_DIR, "resultados", "*.json"),
+            os.path.join(BASE_DIR, "src/data/resultados", "*.json"),
+            os.path.join(BASE_DIR, "data/lotofacil_cache.json"),
+            os.path.join(BASE_DIR, "data/lotofacil_cache.bin"),
+            os.path.join(BASE_DIR, "data/lotofacil_cache.journal"),
+            os.path.join(BASE_DIR, "data/resultados_lotofacil.json"),
+            os.path.join(BASE_DIR, "data/derivados.json")
         ], cwd=BASE_DIR, check=True)
 
         msg = f"update: rankings atualizados até o concurso {total_concursos}"
@@ -282,14 +218,11 @@ def main():
     log(f"{'='*60}", NEGRITO)
 
     # 1. Atualizar cache
-    cache, total_concursos = atualizar_cache()
-    if not cache:
+    concursos, total_concursos = atualizar_cache()
+    if not len(concursos):
         log("\n❌ Sem dados para processar.", VERMELHO)
         sys.exit(1)
 
-    # Converter para formato interno: (id, data, frozenset)
-    concursos = [(c["concurso"], c["data"], frozenset(c["dezenas"])) for c in cache]
-
     # 2. Gerar rankings
     houve_atualizacao = False
     for tamanho in DEZENAS_CONFIG:
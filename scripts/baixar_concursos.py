@@ -1,33 +1,32 @@
-import urllib.request
-import json
+import os
+import sys
 from collections import Counter
-import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from loto_core.ingest import baixar_concursos, baixar_ultimo
+from loto_core.store import adicionar_concursos, atualizar_derivados
 
 print("Baixando TODOS os resultados da Lotofácil...")
-print("Isso pode demorar alguns minutos...\n")
-
-resultados = []
-
-# Tentar baixar até o último disponível (limite de segurança 5000)
-for i in range(1, 5000):
-    url = f"https://servicebus2.caixa.gov.br/portaldeloterias/api/lotofacil/{i}"
-
-    try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=10) as r:
-            data = json.loads(r.read())
-            numeros = sorted([int(n) for n in data["dezenasSorteadasOrdemSorteio"]])
-            resultados.append((i, numeros))
-            if i % 100 == 0:
-                print(f"✅ Baixados {i} concursos...")
-    except Exception as e:
-        print(f"❌ Erro no concurso {i}: {e}")
-    time.sleep(0.1)  # respeitar a API
-
-# Salvar em arquivo para não precisar baixar de novo
-with open("resultados_lotofacil.json", "w") as f:
-    json.dump(resultados, f)
-print(f"\n💾 Salvos {len(resultados)} concursos em resultados_lotofacil.json")
+
+# Descobrir o último disponível (antes: tentava até o limite de segurança 5000)
+ultimo = baixar_ultimo()
+if ultimo is None:
+    raise SystemExit("❌ Não foi possível consultar o concurso mais recente na API.")
+
+# Download concorrente com limite de conexões e retry com backoff (respeita a API)
+baixados = baixar_concursos(range(1, ultimo[0] + 1))
+for i, dados in enumerate(baixados, 1):
+    if dados is None:
+        print(f"❌ Erro no concurso {i}")
+concursos = [d for d in baixados if d is not None]
+resultados = [(c, dezenas) for c, _, dezenas in concursos]
+
+# Salvar no histórico para não precisar baixar de novo
+adicionar_concursos(concursos)
+atualizar_derivados()
+print(f"\n💾 Salvos {len(resultados)} concursos no histórico (data/lotofacil_cache.bin)")
 
 # ANÁLISE COMPLETA
 print("\n--- ANÁLISE COMPLETA ---\n")
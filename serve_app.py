@@ -1,59 +1,366 @@
+import hashlib
 import http.server
-import socketserver
+import json
 import os
 import webbrowser
 import threading
 import time
-import subprocess
 import sys
+from collections import OrderedDict
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs
 
 PORT = 8000
-BASE_DIR = r"C:\Users\nome_do_usuario\LotoMatrix"
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DIRECTORY = os.path.join(BASE_DIR, "super_app")
+sys.path.insert(0, BASE_DIR)
 
-def run_update_scripts():
-    """Runs the update and consolidation scripts."""
+from loto_core.pipeline import PipelineAtualizacao
+from loto_core.logic import dezenas_para_mascara, mascara_para_dezenas
+from loto_core.batch import calcular_scores_lote, calcular_atrasos_faixas, contagens_para_dict
+from loto_core.artifacts import gravar_comprimidos, variante_atualizada, codificacoes_disponiveis
+
+# History stays loaded between runs; each run starts with a cheap probe of the
+# latest contest and skips the rest when nothing changed.
+pipeline = PipelineAtualizacao()
+
+MAX_GAMES_PER_REQUEST = 1000
+
+class ScoreCache:
+    """
+    Bounded LRU of scoring results keyed by game mask. Every call carries the
+    pipeline version the results belong to; a newer version clears the cache
+    and results from an older one are neither returned nor stored.
+    """
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.version = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _current(self, version):
+        # caller holds the lock
+        if version > self.version:
+            self.version = version
+            self._items.clear()
+        return version == self.version
+
+    def get_many(self, masks, version):
+        with self._lock:
+            found = {}
+            if not self._current(version):
+                return found
+            for m in masks:
+                if m in self._items:
+                    self._items.move_to_end(m)
+                    found[m] = self._items[m]
+            return found
+
+    def put_many(self, results, version):
+        with self._lock:
+            if not self._current(version):
+                return
+            self._items.update(results)
+            for m in results:
+                self._items.move_to_end(m)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+score_cache = ScoreCache()
+
+def score_games(games):
+    """
+    Hits 11..15, PESOS score and atraso per threshold for each game (lists of
+    dezenas), or None while there is no history to score against.
+    """
+    historico, version = pipeline.instantaneo()
+    if not len(historico):
+        return None
+    masks = [dezenas_para_mascara(g) for g in games]
+    results = score_cache.get_many(masks, version)
+    missing = sorted(set(masks) - results.keys())
+    if missing:
+        scores, counts, _ = calcular_scores_lote(missing, historico)
+        delays = calcular_atrasos_faixas(missing, historico)
+        computed = {
+            m: {"dezenas": mascara_para_dezenas(m), "acertos": contagens_para_dict(c),
+                "score": int(s), "atrasos": contagens_para_dict(a)}
+            for m, s, c, a in zip(missing, scores, counts, delays)
+        }
+        score_cache.put_many(computed, version)
+        results.update(computed)
+    return {
+        "concurso": int(historico.ids[-1]),
+        "total_concursos": len(historico),
+        "resultados": [results[m] for m in masks],
+    }
+
+def parse_games(payload):
+    """Validated list of games from {"jogos": [[...], ...]} or {"jogo": [...]}."""
+    games = payload.get("jogos") or ([payload["jogo"]] if payload.get("jogo") else [])
+    if not games or len(games) > MAX_GAMES_PER_REQUEST:
+        raise ValueError(f"envie de 1 a {MAX_GAMES_PER_REQUEST} jogos")
+    parsed = []
+    for g in games:
+        if isinstance(g, str):
+            g = g.replace(",", " ").split()
+            if not all(n.isdigit() for n in g):
+                raise ValueError(f"jogo inválido: {g} (dezenas precisam ser inteiros)")
+            g = [int(n) for n in g]
+        # 15.7 or True must not silently become 15 or 1
+        if not isinstance(g, list) or not all(isinstance(n, int) and not isinstance(n, bool) for n in g):
+            raise ValueError(f"jogo inválido: {g} (dezenas precisam ser inteiros)")
+        dezenas = set(g)
+        if not 15 <= len(dezenas) <= 20 or not all(1 <= n <= 25 for n in dezenas):
+            raise ValueError(f"jogo inválido: {g} (15 a 20 dezenas entre 1 e 25)")
+        parsed.append(sorted(dezenas))
+    return parsed
+
+def run_update():
+    """Runs the update pipeline (contests + dashboard) in-process."""
     print("\n[BACKGROUND] Iniciando atualização de dados...")
     try:
-        # 1. Atualizar concursos
-        script1 = os.path.join(BASE_DIR, "scripts", "atualizar_concursos.py")
-        subprocess.run([sys.executable, script1], check=True)
-        
-        # 2. Consolidar dados para o dashboard
-        script2 = os.path.join(BASE_DIR, "scripts", "consolidar_dados.py")
-        subprocess.run([sys.executable, script2], check=True)
-        print("[BACKGROUND] Atualização concluída com sucesso.\n")
+        relatorio = pipeline.executar()
     except Exception as e:
         print(f"[BACKGROUND] Erro na atualização: {e}")
+        raise
+    if relatorio.get("erro"):
+        print(f"[BACKGROUND] {relatorio['erro']}; nada foi alterado.\n")
+    elif relatorio["novos"] or relatorio["painel"]:
+        print(f"[BACKGROUND] Atualização concluída: {relatorio['novos']} concurso(s) novo(s), "
+              f"último {relatorio['ultimo_api']}.\n")
+    else:
+        print(f"[BACKGROUND] Sem novidades (concurso {relatorio['ultimo_api']}).\n")
+    return relatorio
+
+class UpdateJobs:
+    """
+    Background update jobs, one at a time. A trigger while a job is queued or
+    running returns that same job instead of starting another run.
+    """
+    MAX_HISTORY = 20
+
+    def __init__(self, target):
+        self._target = target
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._current = None
+        self._seq = 0
+
+    def trigger(self, origin="api"):
+        """Returns (job, created): the in-flight job, or a newly started one."""
+        with self._lock:
+            if self._current is not None:
+                return dict(self._jobs[self._current]), False
+            self._seq += 1
+            job_id = f"{datetime.now():%Y%m%d%H%M%S}-{self._seq}"
+            self._jobs[job_id] = {
+                "id": job_id, "status": "queued", "origin": origin,
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "started": None, "finished": None, "error": None, "result": None,
+            }
+            self._current = job_id
+            for old in list(self._jobs)[:-self.MAX_HISTORY]:
+                del self._jobs[old]
+            job = dict(self._jobs[job_id])
+        threading.Thread(target=self._run, args=(job_id,), daemon=True).start()
+        return job, True
+
+    def _run(self, job_id):
+        job = self._jobs[job_id]
+        with self._lock:
+            job["status"] = "running"
+            job["started"] = datetime.now().isoformat(timespec="seconds")
+        result = None
+        try:
+            result = self._target()
+            status, error = "done", None
+        except Exception as e:
+            status, error = "error", str(e)
+        with self._lock:
+            job.update(status=status, error=error, result=result,
+                       finished=datetime.now().isoformat(timespec="seconds"))
+            self._current = None
+
+    def status(self, job_id=None):
+        """Copy of a job (the most recent one if job_id is None), or None."""
+        with self._lock:
+            if job_id is None:
+                job_id = next(reversed(self._jobs), None)
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+jobs = UpdateJobs(run_update)
 
 def background_timer():
-    """Timer that runs the update every 30 minutes."""
+    """Timer that triggers the update every 30 minutes."""
     while True:
-        run_update_scripts()
+        jobs.trigger("timer")
         time.sleep(1800) # 30 minutes
 
+COMPRESSIBLE = {".json", ".js", ".css", ".html", ".csv", ".svg", ".txt", ".md"}
+MIN_COMPRESS_SIZE = 1024
+# Content-hashed files never change under the same name
+IMMUTABLE_PREFIXES = ("/data/historico/",)
+
+class StaticValidators:
+    """Strong ETags from content hashes, cached per (size, mtime) of each file."""
+    def __init__(self):
+        self._etags = {}
+        self._lock = threading.Lock()
+
+    def etag(self, path, st):
+        key = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached = self._etags.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+        etag = f'"{h.hexdigest()[:24]}"'
+        with self._lock:
+            self._etags[path] = (key, etag)
+        return etag
+
+validators = StaticValidators()
+compress_lock = threading.Lock()
+
+def compressed_variant(path, size, encoding):
+    """Fresh precompressed file for `encoding`, created once if the writer did not."""
+    variant = variante_atualizada(path, encoding)
+    if variant or size < MIN_COMPRESS_SIZE or os.path.splitext(path)[1] not in COMPRESSIBLE:
+        return variant
+    with compress_lock:
+        variant = variante_atualizada(path, encoding)
+        if variant is None:
+            try:
+                gravar_comprimidos(path)
+            except OSError:
+                return None
+            variant = variante_atualizada(path, encoding)
+    return variant
+
 class Handler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=BASE_DIR, **kwargs)
 
-    def do_GET(self):
-        if self.path == "/api/update":
-            run_update_scripts()
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self.send_header("Access-Control-Allow-Origin", "*")
-            self.end_headers()
-            self.wfile.write(b'{"status": "success", "message": "Dados atualizados"}')
+    def send_json(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_api(self):
+        """Answers the /api/* routes; returns False for anything else."""
+        url = urlsplit(self.path)
+        if url.path == "/api/update":
+            # Enqueue and return right away; progress via /api/status?job=<id>
+            job, created = jobs.trigger()
+            self.send_json(202, dict(job, created=created))
+        elif url.path == "/api/score":
+            try:
+                if self.command == "POST":
+                    length = int(self.headers.get("Content-Length") or 0)
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                else:
+                    payload = {"jogos": parse_qs(url.query).get("jogo", [])}
+                games = parse_games(payload)
+            except (ValueError, TypeError, AttributeError) as e:
+                self.send_json(400, {"error": str(e)})
+                return True
+            result = score_games(games)
+            if result is None:
+                self.send_json(503, {"error": "histórico de concursos indisponível"})
+            else:
+                self.send_json(200, result)
+        elif url.path == "/api/status":
+            job_id = parse_qs(url.query).get("job", [None])[0]
+            job = jobs.status(job_id)
+            if job is None:
+                self.send_json(404, {"error": "job não encontrado"})
+            else:
+                self.send_json(200, job)
         else:
+            return False
+        return True
+
+    def accepted_encodings(self):
+        accepted = set()
+        for item in self.headers.get("Accept-Encoding", "").split(","):
+            name, _, params = item.strip().partition(";")
+            if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                accepted.add(name.strip().lower())
+        # br first: smaller than gzip when available
+        return [e for e in ("br", "gzip") if e in accepted and e in codificacoes_disponiveis()]
+
+    def send_head(self):
+        """Static files with ETag/304, Cache-Control and precompressed variants."""
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            return super().send_head()
+        st = os.stat(path)
+
+        served, encoding = path, None
+        for candidate in self.accepted_encodings():
+            variant = compressed_variant(path, st.st_size, candidate)
+            if variant:
+                served, encoding = variant, candidate
+                break
+
+        etag = validators.etag(path, st)
+        if encoding:
+            etag = f'{etag[:-1]}-{encoding}"'
+        url_path = urlsplit(self.path).path
+        if url_path.startswith(IMMUTABLE_PREFIXES):
+            cache_control = "public, max-age=31536000, immutable"
+        else:
+            cache_control = "no-cache"
+
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+            if "*" in tags or etag in tags:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", cache_control)
+                self.send_header("Vary", "Accept-Encoding")
+                self.end_headers()
+                return None
+
+        f = open(served, "rb")
+        self.send_response(200)
+        self.send_header("Content-type", self.guess_type(path))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+        self.send_header("Last-Modified", self.date_time_string(st.st_mtime))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Vary", "Accept-Encoding")
+        self.end_headers()
+        return f
+
+    def do_GET(self):
+        if not self.handle_api():
             return super().do_GET()
 
+    def do_POST(self):
+        if not self.handle_api():
+            self.send_error(405)
+
 def start_server():
     # Start the background update thread
     update_thread = threading.Thread(target=background_timer, daemon=True)
     update_thread.start()
     
     server_address = ("", PORT)
-    with socketserver.TCPServer(server_address, Handler) as httpd:
+    # One thread per request: static files keep flowing while an update runs
+    with http.server.ThreadingHTTPServer(server_address, Handler) as httpd:
         print(f"Servindo Super App em http://localhost:{PORT}/super_app/index.html")
         print("Pressione Ctrl+C para parar.")
         webbrowser.open(f"http://localhost:{PORT}/super_app/index.html")
@@ -62,9 +62,9 @@ function initAnalyticsPlus() {
     }
 }
 
-function initTrendCharts() {
-    if (!dashboardData || !dashboardData.history) return;
-    const history = [...dashboardData.history].slice(0, 50).reverse();
+async function initTrendCharts() {
+    if (!dashboardData) return;
+    const history = [...await loadHistory()].slice(0, 50).reverse();
     const labels = history.map((_, i) => i + 1);
 
     // Sum Chart
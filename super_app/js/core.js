@@ -20,9 +20,11 @@ const ui = {
 // 1. DATA FETCHING
 async function loadCoreData() {
     try {
-        const res = await fetch('../data/dashboard_data.json?v=' + Date.now());
+        // no-cache: sempre revalida (ETag), mas um resumo igual volta como 304 sem corpo
+        const res = await fetch('../data/dashboard_data.json', { cache: 'no-cache' });
         if (!res.ok) throw new Error('Falha ao ler dados');
         dashboardData = await res.json();
+        historyPromise = null;
 
         if (window.renderDashboard) renderDashboard();
     } catch (err) {
@@ -35,6 +37,41 @@ async function loadCoreData() {
     }
 }
 
+// Histórico completo: o resumo só lista os blocos (nome = hash do conteúdo,
+// nunca mudam), baixados sob demanda e guardados entre recarregamentos.
+const historyChunks = {};
+let historyPromise = null;
+
+function decodeDraw(mask) {
+    const draw = [];
+    for (let n = 1; n <= 25; n++) if (mask & (1 << (n - 1))) draw.push(n);
+    return draw;
+}
+
+async function loadHistory() {
+    const data = dashboardData;
+    if (!data) return [];
+    if (data.history) return data.history;
+    if (!historyPromise) {
+        historyPromise = Promise.all((data.history_chunks || []).map(async chunk => {
+            if (!historyChunks[chunk.arquivo]) {
+                const res = await fetch('../data/' + chunk.arquivo);
+                if (!res.ok) throw new Error('Falha ao ler histórico');
+                const block = await res.json();
+                historyChunks[chunk.arquivo] = block.mascaras.map(decodeDraw);
+            }
+            return historyChunks[chunk.arquivo];
+        })).then(parts => {
+            data.history = parts.flat();
+            return data.history;
+        }).catch(err => {
+            historyPromise = null;
+            throw err;
+        });
+    }
+    return historyPromise;
+}
+
 // 2. NAVIGATION
 function initNavigation() {
     if (!ui.navBtns) return;
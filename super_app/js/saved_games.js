@@ -98,11 +98,11 @@ window.exportSavedToCSV = () => {
 };
 
 // HISTORY
-function renderHistory() {
+async function renderHistory() {
     const body = document.getElementById('history-table-body');
     if (!body || !dashboardData) return;
 
-    const data = dashboardData.history || [];
+    const data = await loadHistory();
     body.innerHTML = data.slice(0, 50).map((game, i) => {
         const concurso = dashboardData.concurso - i;
         const sum = game.reduce((a, b) => a + b, 0);
@@ -136,14 +136,27 @@ window.runPerformanceTest = (manualNumbers = null) => {
         resultsDiv.classList.remove('hidden');
     }
 
-    setTimeout(() => {
-        const hits = { 11: 0, 12: 0, 13: 0, 14: 0, 15: 0 };
-        const history = dashboardData.history || [];
-
-        history.forEach(draw => {
-            const matchCount = draw.filter(n => numbers.includes(n)).length;
-            if (matchCount >= 11) hits[matchCount]++;
-        });
+    setTimeout(async () => {
+        let hits = { 11: 0, 12: 0, 13: 0, 14: 0, 15: 0 };
+        try {
+            // Pontuação no servidor (histórico em memória + cache por jogo)
+            const res = await fetch('/api/score', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ jogos: [numbers] })
+            });
+            if (!res.ok) throw new Error('Falha no /api/score');
+            hits = (await res.json()).resultados[0].acertos;
+        } catch (err) {
+            // Sem servidor (ex.: arquivos estáticos): conta localmente no histórico
+            const picked = new Set(numbers);
+            const history = await loadHistory();
+            history.forEach(draw => {
+                let matchCount = 0;
+                for (const n of draw) if (picked.has(n)) matchCount++;
+                if (matchCount >= 11) hits[matchCount]++;
+            });
+        }
 
         if (resultsDiv) {
             resultsDiv.innerHTML = `
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Raiz do projeto (para importar o loto_core), como nos scripts
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
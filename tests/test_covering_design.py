@@ -0,0 +1,29 @@
+import json
+import os
+import pytest
+from loto_core.coverage import verificar_cobertura
+from loto_core.covering_design import buscar_fechamento, limite_inferior
+
+MATRIZES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "matrices.json")
+
+
+@pytest.mark.parametrize("n, t, jogos", [(17, 14, 8), (18, 14, 24)])
+def test_fechamento_gerado_cobre_todos_os_cenarios(n, t, jogos):
+    fechamento = buscar_fechamento(n, 15, t, reinicios=2, semente=11, processos=1, passos=5000)
+    assert limite_inferior(n, 15, t) <= len(fechamento) <= jogos
+    assert all(len(j) == 15 and all(0 <= d < n for d in j) for j in fechamento)
+
+    dezenas = [[d + 1 for d in j] for j in fechamento]
+    relatorio = verificar_cobertura(dezenas, range(1, n + 1), alvo=t)
+    assert relatorio.garantido and relatorio.minimo >= t
+    # sem um dos jogos a garantia cai: a conferência não é trivial
+    assert not verificar_cobertura(dezenas[1:], range(1, n + 1), alvo=t).garantido
+
+
+def test_matrizes_publicadas_sao_garantidas():
+    with open(MATRIZES) as f:
+        matrizes = json.load(f)
+    for chave, jogos in matrizes.items():
+        n, t, m = (int(x) for x in chave.split("-"))
+        dezenas = [[d + 1 for d in j] for j in jogos]
+        assert verificar_cobertura(dezenas, range(1, n + 1), alvo=t, tamanho_cenario=m).garantido, chave
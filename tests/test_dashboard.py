@@ -0,0 +1,43 @@
+import json
+import os
+from collections import Counter
+from itertools import combinations
+import numpy as np
+from loto_core import dashboard
+from loto_core.dashboard import construir_estado_dashboard, trincas_janela
+
+
+def _historico(n, semente=0):
+    rng = np.random.default_rng(semente)
+    return [(i + 1, "", sorted(rng.choice(np.arange(1, 26), 15, replace=False).tolist())) for i in range(n)]
+
+
+def test_trincas_seguem_o_most_common_da_janela():
+    for n in (3, 40, 100, 260):
+        concursos = _historico(n, semente=n)
+        contagem = Counter()
+        for _, _, dezenas in concursos[-100:]:
+            contagem.update(combinations(dezenas, 3))
+        esperado = [{"dezenas": list(t), "count": c} for t, c in contagem.most_common(15)]
+        assert trincas_janela(construir_estado_dashboard(concursos)) == esperado
+
+
+def test_cada_saida_tem_o_proprio_estado(tmp_path, monkeypatch):
+    monkeypatch.setattr(dashboard, "ESTADO_DIR", str(tmp_path / "estado"))
+    monkeypatch.setattr(dashboard, "CAMINHO_ESTADO_DASHBOARD", str(tmp_path / "estado" / "padrao.json"))
+    rankings = str(tmp_path / "rankings")
+    a, b = str(tmp_path / "a" / "painel.json"), str(tmp_path / "b" / "painel.json")
+    for saida in (a, b):
+        os.makedirs(os.path.dirname(saida))
+    assert dashboard.caminho_estado_painel(dashboard.DASHBOARD_FILE) == dashboard.CAMINHO_ESTADO_DASHBOARD
+    assert len({dashboard.caminho_estado_painel(s) for s in (a, b, dashboard.DASHBOARD_FILE)}) == 3
+
+    curto, longo = _historico(120, semente=1)[:110], _historico(120, semente=1)
+    assert dashboard.gerar_painel(curto, saida=a, rankings_dir=rankings)
+    assert dashboard.gerar_painel(longo, saida=b, rankings_dir=rankings)
+    # a geração de b não mexe no estado de a (nem no padrão)
+    assert not dashboard.gerar_painel(curto, saida=a, rankings_dir=rankings)
+    assert not dashboard.gerar_painel(longo, saida=b, rankings_dir=rankings)
+    assert not os.path.exists(dashboard.CAMINHO_ESTADO_DASHBOARD)
+    with open(a) as f:
+        assert json.load(f)["total_concursos"] == 110
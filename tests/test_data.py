@@ -0,0 +1,45 @@
+from loto_core.data import (
+    DrawHistory, salvar_binario, carregar_binario, anexar_binario,
+    anexar_journal, carregar_journal, data_para_ordinal,
+)
+
+CONCURSOS = [
+    (1, "29/09/2003", list(range(1, 16))),
+    (2, "", list(range(2, 17))),             # data vazia: ordinal 0
+    (3, "data inválida", list(range(3, 18))),
+    (4, "13/10/2003", list(range(11, 26))),
+]
+
+
+def test_data_desconhecida_sobrevive_ao_binario(tmp_path):
+    caminho = str(tmp_path / "hist.bin")
+    salvar_binario(DrawHistory.de_concursos(CONCURSOS), caminho)
+    historico = carregar_binario(caminho)
+    assert historico.ids.tolist() == [1, 2, 3, 4]
+    assert historico.ordinais.tolist()[1:3] == [0, 0]
+    assert [(c, d, sorted(s)) for c, d, s in historico] == [
+        (1, "29/09/2003", CONCURSOS[0][2]),
+        (2, "", CONCURSOS[1][2]),
+        (3, "", CONCURSOS[2][2]),
+        (4, "13/10/2003", CONCURSOS[3][2]),
+    ]
+
+
+def test_data_desconhecida_sobrevive_ao_journal(tmp_path):
+    caminho = str(tmp_path / "hist.journal")
+    for concurso, data_str, dezenas in CONCURSOS:
+        anexar_journal(concurso, data_str, dezenas, caminho)
+    journal = carregar_journal(caminho)
+    assert journal["concurso"].tolist() == [1, 2, 3, 4]
+    assert journal["ordinal"].tolist() == [data_para_ordinal(d) for _, d, _ in CONCURSOS]
+
+
+def test_registro_cortado_e_lixo_sao_descartados(tmp_path):
+    caminho = str(tmp_path / "hist.bin")
+    salvar_binario(DrawHistory.de_concursos(CONCURSOS[:2]), caminho)
+    with open(caminho, "ab") as f:
+        f.write(b"\x07" * 5)                 # write cortado no meio
+    anexar_binario(3, "", CONCURSOS[2][2], caminho)
+    with open(caminho, "ab") as f:
+        f.write(b"\xff" * 12)                # registro implausível
+    assert carregar_binario(caminho).ids.tolist() == [1, 2, 3]
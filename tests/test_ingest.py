@@ -0,0 +1,96 @@
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from loto_core.ingest import baixar_concursos, baixar_ultimo
+
+ULTIMO = 12
+FALHAS = {7: (429, "0"), 8: (503, "0"), 9: (503, None)}   # primeira resposta de cada um
+
+
+def _dezenas(n):
+    return [(n + i) % 25 + 1 for i in range(15)]
+
+
+class _Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive
+
+    def do_GET(self):
+        numero = self.path.rsplit("/", 1)[1]
+        numero = int(numero) if numero else ULTIMO
+        srv = self.server
+        with srv.lock:
+            srv.pedidos[numero] += 1
+            srv.conexoes.add(self.client_address)
+            vez = srv.pedidos[numero]
+        if numero in FALHAS and vez == 1:
+            status, retry = FALHAS[numero]
+            self._responder(status, b"", {"Retry-After": retry} if retry else {})
+        elif 1 <= numero <= ULTIMO:
+            corpo = {"numero": numero, "dataApuracao": "01/02/2024", "listaDezenas": [f"{d:02d}" for d in _dezenas(numero)]}
+            self._responder(200, json.dumps(corpo).encode(), {"Content-Type": "application/json"})
+        else:
+            self._responder(404, b"")
+
+    def _responder(self, status, corpo, headers={}):
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    srv.lock = threading.Lock()
+    srv.pedidos = Counter()
+    srv.conexoes = set()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    srv.base_url = f"http://127.0.0.1:{srv.server_address[1]}/lotofacil/{{}}"
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_resultados_na_ordem_pedida(servidor):
+    numeros = [5, 1, 12, 3, 10, 2]
+    resultados = baixar_concursos(numeros, base_url=servidor.base_url, concorrencia=3)
+    assert [r[0] for r in resultados] == numeros
+    assert all(r[1] == "01/02/2024" and r[2] == sorted(_dezenas(r[0])) for r in resultados)
+    assert baixar_ultimo(base_url=servidor.base_url)[0] == ULTIMO
+
+
+def test_repete_429_e_503_usando_retry_after(servidor):
+    inicio = time.monotonic()
+    # espera_base alta: só termina rápido se o Retry-After (0 s) for respeitado
+    resultados = baixar_concursos([7, 8], base_url=servidor.base_url, espera_base=30)
+    assert time.monotonic() - inicio < 10
+    assert [r[0] for r in resultados] == [7, 8]
+    assert servidor.pedidos[7] == 2 and servidor.pedidos[8] == 2
+
+
+def test_sem_retry_after_usa_backoff(servidor):
+    resultados = baixar_concursos([9], base_url=servidor.base_url, espera_base=0.01)
+    assert resultados[0][0] == 9
+    assert servidor.pedidos[9] == 2
+
+
+def test_404_nao_e_repetido(servidor):
+    assert baixar_concursos([99], base_url=servidor.base_url, tentativas=4) == [None]
+    assert servidor.pedidos[99] == 1
+
+
+def test_conexoes_reaproveitadas(servidor):
+    numeros = list(range(1, ULTIMO + 1)) * 3
+    resultados = baixar_concursos(numeros, base_url=servidor.base_url, concorrencia=2)
+    assert all(r is not None for r in resultados)
+    # uma sessão keep-alive por thread do pool: no máximo uma conexão por thread
+    assert len(servidor.conexoes) <= 2
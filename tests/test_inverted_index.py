@@ -0,0 +1,33 @@
+from collections import Counter
+import numpy as np
+from loto_core.inverted_index import IndiceInvertido
+
+
+def _historico(n, semente=0):
+    rng = np.random.default_rng(semente)
+    return [(i + 1, "", sorted(rng.choice(np.arange(1, 26), 15, replace=False).tolist())) for i in range(n)]
+
+
+def _contador(historico, alvos):
+    contador = Counter()
+    for _, _, sorteio in historico:
+        if all(a in sorteio for a in alvos):
+            contador.update(d for d in sorteio if d not in alvos)
+    return contador
+
+
+def test_parceiras_na_ordem_de_primeira_aparicao():
+    # 25 aparece cedo e 2 só depois: no empate 25 vem antes, como no Counter
+    base = [d for d in range(1, 26) if d not in (2, 25)]
+    historico = [
+        (1, "", sorted(base[:14] + [25])),
+        (2, "", sorted(base[:14] + [2])),
+    ] + _historico(60)
+    indice = IndiceInvertido.de_historico(historico)
+    for alvos in ([1], [3], [1, 3], [10, 11, 12]):
+        total, parceiras = indice.parceiras(alvos)
+        contador = _contador(historico, alvos)
+        assert total == indice.contar(alvos)
+        assert list(parceiras.items()) == list(contador.items())
+        ranking = sorted(parceiras.items(), key=lambda item: -item[1])
+        assert ranking == contador.most_common()
@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+from loto_core import parallel
+from loto_core.coverage import verificar_cobertura
+
+
+def _somar(dados, tarefa):
+    return dados + tarefa
+
+
+def test_mapear_serial_e_em_processos_dao_o_mesmo():
+    tarefas = list(range(10))
+    assert list(parallel.mapear(_somar, tarefas, 100, processos=1)) == list(range(100, 110))
+    assert list(parallel.mapear(_somar, tarefas, 100, processos=2)) == list(range(100, 110))
+    assert parallel._worker is None   # o processo chamador não guarda estado
+
+
+def test_caminho_serial_pode_rodar_em_threads():
+    grupo = range(1, 19)
+    fechamentos = [[list(range(1, 16))], [list(range(4, 19))], [list(range(1, 16)), list(range(4, 19))]]
+
+    def distribuicao(jogos):
+        return verificar_cobertura(jogos, grupo, processos=1, bloco=64).distribuicao.tolist()
+
+    esperado = [distribuicao(j) for j in fechamentos]
+    with ThreadPoolExecutor(6) as ex:
+        obtido = list(ex.map(distribuicao, fechamentos * 4))
+    assert obtido == esperado * 4
@@ -0,0 +1,61 @@
+import pytest
+from loto_core import pipeline as modulo
+from loto_core.data import DrawHistory
+
+
+class _Store:
+    """Store em memória: a assinatura muda a cada gravação, como o stat do arquivo."""
+
+    def __init__(self, n):
+        self.concursos = [(i, "", list(range(1 + i % 10, 16 + i % 10))) for i in range(1, n + 1)]
+        self.gravacoes = 0
+
+    def gravar(self, concurso):
+        self.concursos.append(concurso)
+        self.gravacoes += 1
+
+    def historico(self):
+        return DrawHistory.de_concursos(self.concursos)
+
+    def assinatura(self):
+        return {"tamanho": len(self.concursos), "mtime_ns": self.gravacoes}
+
+
+@pytest.fixture
+def ambiente(monkeypatch):
+    store = _Store(5)
+    chamadas = {"derivados": 0, "painel": []}
+    monkeypatch.setattr(modulo, "carregar_historico", store.historico)
+    monkeypatch.setattr(modulo, "assinatura_fonte", store.assinatura)
+    monkeypatch.setattr(modulo, "baixar_ultimo", lambda **_: None)   # API fora do ar
+    monkeypatch.setattr(modulo, "atualizar_derivados", lambda: chamadas.__setitem__("derivados", chamadas["derivados"] + 1))
+    monkeypatch.setattr(modulo, "gerar_painel", lambda h, forcar=False: chamadas["painel"].append(len(h)) or True)
+    return store, chamadas
+
+
+def test_instantaneo_ve_sorteio_gravado_por_outro_processo(ambiente):
+    store, _ = ambiente
+    p = modulo.PipelineAtualizacao()
+    historico, versao = p.instantaneo()
+    assert (len(historico), versao) == (5, 0)
+    assert p.instantaneo()[1] == 0
+
+    store.gravar((6, "", list(range(1, 16))))
+    historico, versao = p.instantaneo()
+    assert (len(historico), versao) == (6, 1)
+
+
+def test_sem_api_ainda_publica_o_que_mudou_no_disco(ambiente):
+    store, chamadas = ambiente
+    p = modulo.PipelineAtualizacao()
+    assert p.executar()["erro"] == "API indisponível"
+    assert chamadas == {"derivados": 0, "painel": []}
+
+    store.gravar((6, "", list(range(1, 16))))
+    p.instantaneo()                      # uma requisição recarrega antes da execução
+    relatorio = p.executar()
+    assert "erro" not in relatorio and relatorio["painel"]
+    assert chamadas == {"derivados": 1, "painel": [6]}
+
+    assert p.executar()["erro"] == "API indisponível"
+    assert chamadas["derivados"] == 1
@@ -0,0 +1,32 @@
+import pytest
+import serve_app
+from loto_core.data import DrawHistory
+
+JOGO = list(range(1, 16))
+
+
+def test_parse_games_aceita_listas_e_texto():
+    assert serve_app.parse_games({"jogo": JOGO[::-1]}) == [JOGO]
+    assert serve_app.parse_games({"jogos": [" ".join(map(str, JOGO)), ",".join(map(str, range(5, 22)))]}) == [
+        JOGO, list(range(5, 22))]
+
+
+@pytest.mark.parametrize("jogo", [
+    JOGO[:-1] + [15.7],
+    JOGO[:-1] + [True],
+    JOGO[:-1] + ["15"],
+    JOGO[:-1] + [None],
+    " ".join(map(str, JOGO[:-1])) + " 15.7",
+    {str(d): d for d in JOGO},
+    JOGO[:-1],
+    JOGO[:-1] + [26],
+])
+def test_parse_games_rejeita_dezenas_invalidas(jogo):
+    with pytest.raises(ValueError):
+        serve_app.parse_games({"jogos": [jogo]})
+
+
+def test_score_sem_historico(monkeypatch):
+    vazio = DrawHistory([], [], [], ordenado=True)
+    monkeypatch.setattr(serve_app.pipeline, "instantaneo", lambda: (vazio, 0))
+    assert serve_app.score_games([JOGO]) is None
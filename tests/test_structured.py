@@ -0,0 +1,53 @@
+from itertools import chain, combinations, product
+import numpy as np
+from loto_core.backtest import backtest
+from loto_core.batch import popcount32
+from loto_core.data import DrawHistory
+from loto_core.logic import dezenas_para_mascara
+from loto_core.structured import FamiliaFora, avaliar_familia, conferir_fora
+
+
+def _historico(n, semente=0):
+    rng = np.random.default_rng(semente)
+    return [(i + 1, "", sorted(rng.choice(np.arange(1, 26), 15, replace=False).tolist())) for i in range(n)]
+
+
+def test_familia_pequena_contra_enumeracao():
+    # 3 grupos, apostas montadas uma a uma com itertools
+    grupos_dezenas = [list(range(1, 9)), list(range(9, 17)), list(range(17, 26))]
+    grupos = [dezenas_para_mascara(g) for g in grupos_dezenas]
+    escolhas_lista = [(2, 3, 2), (3, 3, 3), (1, 4, 5), (0, 2, 6)]
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        sorteio = set(rng.choice(np.arange(1, 26), 15, replace=False).tolist())
+        esperado = np.zeros(16, dtype=np.int64)
+        for escolhas in escolhas_lista:
+            partes = [combinations(g, c) for g, c in zip(grupos_dezenas, escolhas)]
+            for aposta in product(*partes):
+                esperado[len(sorteio.intersection(chain(*aposta)))] += 1
+        assert avaliar_familia(grupos, escolhas_lista, sorted(sorteio)).tolist() == esperado.tolist()
+
+
+def test_fora_contra_apostas_materializadas():
+    historico = DrawHistory.de_concursos(_historico(6, semente=2))
+    familia = FamiliaFora((5, 6, 7))
+    apostas = familia(historico[:1])
+    assert len(np.unique(apostas)) == len(apostas) == familia.n_apostas
+    for i in range(1, len(historico)):
+        apostas = familia(historico[:i])
+        sorteio = int(historico.mascaras[i])
+        bruto = np.bincount(popcount32(apostas & np.uint32(sorteio)), minlength=16)
+        assert bruto.tolist() == familia.distribuicao(historico[:i], sorteio).tolist()
+
+
+def test_backtest_fechado_igual_ao_materializado():
+    historico = _historico(5, semente=3)
+    familia = FamiliaFora((5, 6, 7))
+    fechado = backtest(historico, familia)
+    bruto = backtest(historico, familia.__call__)   # sem .distribuicao: confere aposta a aposta
+    assert fechado.resumo() == bruto.resumo()
+    assert np.array_equal(fechado.faixas, bruto.faixas)
+
+
+def test_conferir_fora():
+    assert conferir_fora(_historico(30, semente=4), amostra=5) == 5